@@ -1,16 +1,30 @@
+import asyncio
 import requests
 import pandas as pd
 import sqlite3
+import sys
 import time
+from contextlib import closing
+from pathlib import Path
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
+from matplotlib.transforms import offset_copy
 import numpy as np
+from joblib import dump, load
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-import networkx as nx
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
 from typing import List, Dict, Any, Optional
 
+# Optional Arrow-native SQLite reader (falls back to pandas.read_sql_query)
+try:
+    import adbc_driver_sqlite.dbapi as adbc_sqlite
+    ADBC_AVAILABLE = True
+except ImportError:
+    ADBC_AVAILABLE = False
+
 # ==========================================
 # DEMO MARITIME ROUTE OPTIMIZATION APPLICATION
 # ==========================================
@@ -26,6 +40,44 @@ TOMORROW_IO_API_KEY = "xHCjSZ79QhO9KWq3Lubr9wb081zzrgK1"  # Get from tomorrow.io
 TEST_LAT = 37.5
 TEST_LON = -122.5
 
+# Demo database file
+DB_NAME = 'maritime_demo.db'
+
+# SQLite tuning applied when the demo database is opened
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Weather features used for ML, with fallbacks for fields a source may omit
+WEATHER_FEATURE_DEFAULTS = {
+    'wave_height_m': 0,
+    'wind_speed_ms': 0,
+    'ocean_current_velocity_ms': 0,
+    'ocean_current_direction_deg': 0,
+    'temperature_c': 20,
+    'humidity_percent': 50,
+}
+
+# ML feature matrix columns, in order
+ML_FEATURE_COLUMNS = ['latitude', 'longitude', 'speed', 'course', *WEATHER_FEATURE_DEFAULTS]
+
+# Random Forest hyperparameters for the route model
+RF_PARAMS = {'n_estimators': 100, 'max_depth': 12, 'random_state': 42}
+
+# Cached route model, reused while the feature columns and hyperparameters match (--retrain refreshes it)
+MODEL_CACHE_PATH = 'rf_route.joblib'
+MODEL_CACHE_KEY = repr((ML_FEATURE_COLUMNS, sorted(RF_PARAMS.items())))
+
+# Mean Earth radius in nautical miles
+EARTH_RADIUS_NM = 3440.065
+
+# Number of forward successors each waypoint connects to in optimize_route
+ROUTE_MAX_HOP = 3
+
 def create_sample_ais_data() -> List[Dict]:
     """Create sample AIS data for demonstration purposes"""
     sample_vessels = [
@@ -131,21 +183,20 @@ def fetch_tomorrow_io_weather(lat: float, lon: float, api_key: str, hours: int =
         data = response.json()
         intervals = data.get('data', {}).get('timelines', [{}])[0].get('intervals', [])
         
-        weather_data = []
-        for interval in intervals[:hours]:
-            values = interval.get('values', {})
-            weather_data.append({
-                'time': pd.to_datetime(interval.get('startTime')),
-                'temperature_c': values.get('temperature'),
-                'wind_speed_ms': values.get('windSpeed'),
-                'precipitation_intensity': values.get('precipitationIntensity'),
-                'humidity_percent': values.get('humidity'),
-                'wave_significant_height_m': values.get('waveSignificantHeight'),
-                'sea_current_speed_ms': values.get('seaCurrentSpeed'),
-                'sea_current_direction_deg': values.get('seaCurrentDirection')
-            })
-        
-        df = pd.DataFrame(weather_data)
+        # Build typed columns directly instead of a list of per-hour dicts
+        intervals = intervals[:hours]
+        values = [interval.get('values', {}) for interval in intervals]
+        
+        df = pd.DataFrame({
+            'time': pd.to_datetime([interval.get('startTime') for interval in intervals]),
+            'temperature_c': [v.get('temperature') for v in values],
+            'wind_speed_ms': [v.get('windSpeed') for v in values],
+            'precipitation_intensity': [v.get('precipitationIntensity') for v in values],
+            'humidity_percent': [v.get('humidity') for v in values],
+            'wave_significant_height_m': [v.get('waveSignificantHeight') for v in values],
+            'sea_current_speed_ms': [v.get('seaCurrentSpeed') for v in values],
+            'sea_current_direction_deg': [v.get('seaCurrentDirection') for v in values]
+        })
         print(f"✓ Collected {len(df)} hours of weather data from Tomorrow.io")
         return df
         
@@ -153,6 +204,18 @@ def fetch_tomorrow_io_weather(lat: float, lon: float, api_key: str, hours: int =
         print(f"Error fetching Tomorrow.io data: {e}")
         return pd.DataFrame()
 
+async def _fetch_weather_async(lat: float, lon: float, api_key: str, hours: int = 24) -> tuple:
+    """Run both weather fetchers concurrently so their round-trips overlap"""
+    return await asyncio.gather(
+        asyncio.to_thread(fetch_open_meteo_weather, lat, lon, hours),
+        asyncio.to_thread(fetch_tomorrow_io_weather, lat, lon, api_key, hours)
+    )
+
+def fetch_weather_concurrently(lat: float, lon: float, api_key: str, hours: int = 24) -> tuple:
+    """Fetch Open-Meteo and Tomorrow.io data in parallel; returns (open_meteo_df, tomorrow_df)"""
+    open_meteo_df, tomorrow_df = asyncio.run(_fetch_weather_async(lat, lon, api_key, hours))
+    return open_meteo_df, tomorrow_df
+
 def combine_weather_data(open_meteo_df: pd.DataFrame, tomorrow_df: pd.DataFrame) -> pd.DataFrame:
     """Combine weather data from both sources using outer join on time"""
     try:
@@ -164,18 +227,17 @@ def combine_weather_data(open_meteo_df: pd.DataFrame, tomorrow_df: pd.DataFrame)
         if tomorrow_df.empty:
             return open_meteo_df
         
-        # Normalize timezone for both DataFrames
-        open_meteo_df['time'] = pd.to_datetime(open_meteo_df['time']).dt.tz_localize(None)
-        tomorrow_df['time'] = pd.to_datetime(tomorrow_df['time']).dt.tz_localize(None)
+        # Normalize timezone for both DataFrames (fetchers already parse 'time')
+        open_meteo_df['time'] = open_meteo_df['time'].dt.tz_localize(None)
+        tomorrow_df['time'] = tomorrow_df['time'].dt.tz_localize(None)
         
-        # Merge on time column
-        combined_df = pd.merge(
-            open_meteo_df, 
-            tomorrow_df, 
-            on='time', 
+        # Join on a sorted time index rather than a hash merge on the column
+        combined_df = open_meteo_df.set_index('time').sort_index().join(
+            tomorrow_df.set_index('time').sort_index(),
             how='outer',
-            suffixes=('_openmeteo', '_tomorrow')
-        )
+            lsuffix='_openmeteo',
+            rsuffix='_tomorrow'
+        ).reset_index()
         
         print(f"✓ Combined weather data: {len(combined_df)} records")
         return combined_df
@@ -184,12 +246,19 @@ def combine_weather_data(open_meteo_df: pd.DataFrame, tomorrow_df: pd.DataFrame)
         print(f"Error combining weather data: {e}")
         return pd.DataFrame()
 
-def setup_database(db_name: str = 'maritime_demo.db'):
+def connect_database(db_name: str = DB_NAME) -> sqlite3.Connection:
+    """Open the demo database in autocommit mode; callers issue explicit BEGIN/COMMIT"""
+    return sqlite3.connect(db_name, isolation_level=None)
+
+def setup_database(conn: sqlite3.Connection):
     """Create database tables if they don't exist"""
     try:
-        conn = sqlite3.connect(db_name)
         cursor = conn.cursor()
-        
+
+        # WAL journal + relaxed sync keeps the ingest phase off the fsync path
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+
         # Create weather table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS weather (
@@ -222,50 +291,60 @@ def setup_database(db_name: str = 'maritime_demo.db'):
                 vessel_name TEXT
             )
         ''')
-        
-        conn.commit()
-        conn.close()
+
+        # Index on the AIS merge key used by prepare_ml_data (weather.time is indexed as the PRIMARY KEY)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_ais_timestamp ON ais(timestamp)")
+        cursor.execute("DROP INDEX IF EXISTS idx_weather_time")  # redundant index from earlier runs
+
         print("✓ Database setup complete")
         
     except Exception as e:
         print(f"Error setting up database: {e}")
 
-def store_weather_data(df: pd.DataFrame, db_name: str = 'maritime_demo.db'):
+def store_weather_data(df: pd.DataFrame, conn: sqlite3.Connection):
     """Store combined weather data in database"""
     try:
         if df.empty:
             print("No weather data to store")
             return
         
-        conn = sqlite3.connect(db_name)
+        # Explicit BEGIN so the whole batch is one transaction
+        cursor = conn.cursor()
         
-        # Convert datetime to string for SQLite
-        df_copy = df.copy()
-        df_copy['time'] = df_copy['time'].astype(str)
+        columns = list(df.columns)
+        placeholders = ", ".join("?" for _ in columns)
         
-        df_copy.to_sql('weather', conn, if_exists='replace', index=False)
-        conn.close()
+        # Stringify time for SQLite without copying the whole frame
+        rows = df.assign(time=df['time'].astype(str)).itertuples(index=False, name=None)
+        
+        try:
+            cursor.execute("BEGIN")
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO weather ({', '.join(columns)}) VALUES ({placeholders})",
+                rows
+            )
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
         
         print(f"✓ Stored {len(df)} weather records in database")
         
     except Exception as e:
         print(f"Error storing weather data: {e}")
 
-def store_ais_data(vessel_list: List[Dict], db_name: str = 'maritime_demo.db'):
+def store_ais_data(vessel_list: List[Dict], conn: sqlite3.Connection):
     """Store AIS vessel data in database"""
     try:
         if not vessel_list:
             print("No AIS data to store")
             return
         
-        conn = sqlite3.connect(db_name)
+        # Explicit BEGIN so the whole batch is one transaction
         cursor = conn.cursor()
-        
-        for vessel in vessel_list:
-            cursor.execute('''
-                INSERT INTO ais (mmsi, latitude, longitude, speed, course, timestamp, vessel_name)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+
+        rows = [
+            (
                 vessel.get('mmsi'),
                 vessel.get('latitude'),
                 vessel.get('longitude'),
@@ -273,28 +352,47 @@ def store_ais_data(vessel_list: List[Dict], db_name: str = 'maritime_demo.db'):
                 vessel.get('course'),
                 vessel.get('timestamp'),
                 vessel.get('vessel_name')
-            ))
-        
-        conn.commit()
-        conn.close()
+            )
+            for vessel in vessel_list
+        ]
+
+        try:
+            cursor.execute("BEGIN")
+            cursor.executemany('''
+                INSERT INTO ais (mmsi, latitude, longitude, speed, course, timestamp, vessel_name)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
         
         print(f"✓ Stored {len(vessel_list)} AIS records in database")
         
     except Exception as e:
         print(f"Error storing AIS data: {e}")
 
-def load_data_from_db(db_name: str = 'maritime_demo.db') -> tuple:
+def load_data_from_db(conn: sqlite3.Connection) -> tuple:
     """Load weather and AIS data from database"""
     try:
-        conn = sqlite3.connect(db_name)
-        
-        # Load weather data
-        weather_df = pd.read_sql_query("SELECT * FROM weather", conn)
-        
-        # Load AIS data
-        ais_df = pd.read_sql_query("SELECT * FROM ais", conn)
+        if ADBC_AVAILABLE:
+            # Columnar fetch straight into Arrow, skipping per-row Python tuples
+            db_path = conn.execute("PRAGMA database_list").fetchone()[2]
+            with adbc_sqlite.connect(db_path) as adbc_conn, adbc_conn.cursor() as cursor:
+                cursor.execute("SELECT * FROM weather")
+                weather_df = cursor.fetch_arrow_table().to_pandas()
+                cursor.execute("SELECT * FROM ais")
+                ais_df = cursor.fetch_arrow_table().to_pandas()
+        else:
+            # Load weather data
+            weather_df = pd.read_sql_query("SELECT * FROM weather", conn)
+            
+            # Load AIS data
+            ais_df = pd.read_sql_query("SELECT * FROM ais", conn)
         
-        conn.close()
+        # Parse timestamps once here so downstream code can use them directly
+        weather_df['time'] = pd.to_datetime(weather_df['time'])
+        ais_df['timestamp'] = pd.to_datetime(ais_df['timestamp'])
         
         print(f"✓ Loaded {len(weather_df)} weather records and {len(ais_df)} AIS records")
         return weather_df, ais_df
@@ -311,12 +409,11 @@ def compute_averages(weather_df: pd.DataFrame, ais_df: pd.DataFrame):
         
         if not weather_df.empty:
             print("\n🌊 WEATHER CONDITIONS:")
-            numeric_cols = weather_df.select_dtypes(include=[np.number]).columns
+            # One vectorized reduction; all-NaN columns come back as NaN and are dropped
+            means = weather_df.mean(numeric_only=True)
             
-            for col in numeric_cols:
-                if weather_df[col].notna().any():
-                    avg_val = weather_df[col].mean()
-                    print(f"  Average {col}: {avg_val:.2f}")
+            for col, avg_val in means.dropna().items():
+                print(f"  Average {col}: {avg_val:.2f}")
         
         if not ais_df.empty:
             print("\n🚢 VESSEL ACTIVITY:")
@@ -360,20 +457,18 @@ def plot_vessel_positions(ais_df: pd.DataFrame, weather_df: pd.DataFrame):
         # Add colorbar
         plt.colorbar(scatter, ax=ax1, label='Speed (knots)')
         
-        # Add vessel names as labels
-        for idx, row in ais_df.iterrows():
-            ax1.annotate(
-                row['vessel_name'][:10],  # Truncate long names
-                (row['longitude'], row['latitude']),
-                xytext=(5, 5),
-                textcoords='offset points',
-                fontsize=8,
-                alpha=0.8
-            )
+        # Add vessel names as labels. Limits are computed from the data and then frozen so the labels
+        # don't trigger relayout; all labels share one 5pt-offset transform instead of an annotate each
+        ax1.autoscale_view()
+        ax1.set_autoscale_on(False)
+        label_offset = offset_copy(ax1.transData, fig=fig, x=5, y=5, units='points')
+        labels = ais_df['vessel_name'].fillna('').str[:10]  # Truncate long names
+        for label, lon, lat in zip(labels.to_numpy(), ais_df['longitude'].to_numpy(),
+                                   ais_df['latitude'].to_numpy()):
+            ax1.text(lon, lat, label, transform=label_offset, fontsize=8, alpha=0.8)
         
         # Plot 2: Weather conditions over time (if available)
         if not weather_df.empty and 'time' in weather_df.columns:
-            weather_df['time'] = pd.to_datetime(weather_df['time'])
             weather_df = weather_df.sort_values('time')
             
             ax2.plot(weather_df['time'], weather_df.get('wave_height_m', 0), 
@@ -398,6 +493,35 @@ def plot_vessel_positions(ais_df: pd.DataFrame, weather_df: pd.DataFrame):
     except Exception as e:
         print(f"Error creating plots: {e}")
 
+def load_or_train_model(X: np.ndarray, y: np.ndarray, cache_path: str = MODEL_CACHE_PATH,
+                        retrain: bool = False):
+    """Reuse the cached (model, scaler) pair unless retrain is set or its features/hyperparameters changed"""
+    if X is None or y is None:
+        return None, None
+    
+    cache = Path(cache_path)
+    if cache.exists() and not retrain:
+        try:
+            cached_key, model, scaler = load(cache)
+            if cached_key == MODEL_CACHE_KEY:
+                print(f"✓ Loaded cached ML model from {cache}")
+                return model, scaler
+        except Exception as e:
+            print(f"Error loading cached ML model: {e}")
+    
+    model, scaler = train_route_optimization_model(X, y)
+    if model is not None:
+        dump((MODEL_CACHE_KEY, model, scaler), cache, compress=3)
+    return model, scaler
+
+def optimal_speed_target(speed: np.ndarray, wave_height_m: np.ndarray,
+                         wind_speed_ms: np.ndarray) -> np.ndarray:
+    """Adjust observed speeds for conditions: slower in high waves, faster in light winds"""
+    # Conditions are checked in order, first match wins; add new rules here
+    conditions = [wave_height_m > 2, wind_speed_ms < 5]
+    factors = [0.8, 1.1]
+    return speed * np.select(conditions, factors, default=1.0)
+
 def prepare_ml_data(weather_df: pd.DataFrame, ais_df: pd.DataFrame) -> tuple:
     """Prepare data for machine learning route optimization"""
     try:
@@ -405,50 +529,38 @@ def prepare_ml_data(weather_df: pd.DataFrame, ais_df: pd.DataFrame) -> tuple:
             print("Insufficient data for ML training")
             return None, None
         
-        # Create features for route optimization
-        features = []
-        targets = []
-        
-        for idx, vessel in ais_df.iterrows():
-            # Find corresponding weather conditions
-            vessel_time = pd.to_datetime(vessel['timestamp'])
-            
-            # Get weather data closest to vessel timestamp
-            weather_subset = weather_df.copy()
-            weather_subset['time'] = pd.to_datetime(weather_subset['time'])
-            weather_subset['time_diff'] = abs(weather_subset['time'] - vessel_time)
-            
-            closest_weather = weather_subset.loc[weather_subset['time_diff'].idxmin()]
-            
-            # Create feature vector
-            feature_vector = [
-                vessel['latitude'],
-                vessel['longitude'],
-                vessel['speed'],
-                vessel['course'],
-                closest_weather.get('wave_height_m', 0),
-                closest_weather.get('wind_speed_ms', 0),
-                closest_weather.get('ocean_current_velocity_ms', 0),
-                closest_weather.get('ocean_current_direction_deg', 0),
-                closest_weather.get('temperature_c', 20),
-                closest_weather.get('humidity_percent', 50)
-            ]
-            
-            # Target: optimal speed (higher in favorable conditions)
-            optimal_speed = vessel['speed']
-            
-            # Adjust based on conditions
-            if closest_weather.get('wave_height_m', 0) > 2:  # High waves
-                optimal_speed *= 0.8  # Reduce speed
-            elif closest_weather.get('wind_speed_ms', 0) < 5:  # Light winds
-                optimal_speed *= 1.1  # Increase speed
-            
-            features.append(feature_vector)
-            targets.append(optimal_speed)
-        
-        X = np.array(features)
-        y = np.array(targets)
-        
+        # Nearest-in-time weather row for every vessel in one sorted join
+        ais_sorted = ais_df.sort_values('timestamp')
+        weather_sorted = weather_df.sort_values('time')
+
+        merged = pd.merge_asof(
+            ais_sorted,
+            weather_sorted,
+            left_on='timestamp',
+            right_on='time',
+            direction='nearest'
+        )
+
+        # Fill in any weather fields the sources did not provide
+        for col, default in WEATHER_FEATURE_DEFAULTS.items():
+            if col in merged.columns:
+                merged[col] = pd.to_numeric(merged[col], errors='coerce').fillna(default)
+            else:
+                merged[col] = default
+
+        # Fill a preallocated float32 feature matrix column by column, avoiding an
+        # intermediate DataFrame (float32 halves memory traffic through scaler and model)
+        X = np.empty((len(merged), len(ML_FEATURE_COLUMNS)), dtype=np.float32)
+        for k, col in enumerate(ML_FEATURE_COLUMNS):
+            X[:, k] = merged[col].to_numpy()
+
+        # Target: optimal speed
+        y = optimal_speed_target(
+            merged['speed'].to_numpy(dtype=np.float32),
+            merged['wave_height_m'].to_numpy(dtype=np.float32),
+            merged['wind_speed_ms'].to_numpy(dtype=np.float32)
+        ).astype(np.float32)
+
         print(f"✓ Prepared {len(X)} data points for ML training")
         return X, y
         
@@ -470,8 +582,9 @@ def train_route_optimization_model(X: np.ndarray, y: np.ndarray):
         X_train_scaled = scaler.fit_transform(X_train)
         X_test_scaled = scaler.transform(X_test)
         
-        # Train Random Forest model
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
+        # Train Random Forest model; trees are built and queried in parallel,
+        # and the depth cap keeps per-sample traversal cheap at predict time
+        model = RandomForestRegressor(n_jobs=-1, **RF_PARAMS)
         model.fit(X_train_scaled, y_train)
         
         # Evaluate model
@@ -485,6 +598,12 @@ def train_route_optimization_model(X: np.ndarray, y: np.ndarray):
         print(f"Error training ML model: {e}")
         return None, None
 
+def haversine_nm(lat1, lon1, lat2, lon2):
+    """Vectorized great-circle distance in nautical miles; inputs broadcast as NumPy arrays"""
+    lat1, lon1, lat2, lon2 = map(np.deg2rad, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+    return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(a))
+
 def optimize_route(start_lat: float, start_lon: float, end_lat: float, end_lon: float, 
                   model, scaler, weather_df: pd.DataFrame) -> List[tuple]:
     """Generate an optimized route using the trained model"""
@@ -492,9 +611,6 @@ def optimize_route(start_lat: float, start_lon: float, end_lat: float, end_lon:
         if model is None:
             return []
         
-        # Create a simple route using NetworkX
-        G = nx.Graph()
-        
         # Generate waypoints between start and end
         num_waypoints = 10
         lats = np.linspace(start_lat, end_lat, num_waypoints)
@@ -502,54 +618,74 @@ def optimize_route(start_lat: float, start_lon: float, end_lat: float, end_lon:
         
         waypoints = list(zip(lats, lons))
         
-        # Add nodes to graph
-        for i, (lat, lon) in enumerate(waypoints):
-            G.add_node(i, pos=(lat, lon))
-        
-        # Add edges with weights based on predicted optimal speed
-        for i in range(len(waypoints) - 1):
-            for j in range(i + 1, len(waypoints)):
-                # Calculate distance
-                dist = np.sqrt((waypoints[j][0] - waypoints[i][0])**2 + 
-                              (waypoints[j][1] - waypoints[i][1])**2)
-                
-                # Get weather conditions for midpoint
-                mid_lat = (waypoints[i][0] + waypoints[j][0]) / 2
-                mid_lon = (waypoints[i][1] + waypoints[j][1]) / 2
-                
-                # Find closest weather data
-                weather_subset = weather_df.copy()
-                if not weather_df.empty:
-                    weather_subset['dist'] = np.sqrt(
-                        (weather_subset.get('latitude', mid_lat) - mid_lat)**2 +
-                        (weather_subset.get('longitude', mid_lon) - mid_lon)**2
-                    )
-                    closest_weather = weather_subset.loc[weather_subset['dist'].idxmin()]
-                else:
-                    closest_weather = {}
-                
-                # Create feature vector for prediction
-                features = np.array([[
-                    mid_lat, mid_lon, 10, 0,  # Default speed and course
-                    closest_weather.get('wave_height_m', 1),
-                    closest_weather.get('wind_speed_ms', 5),
-                    closest_weather.get('ocean_current_velocity_ms', 0.5),
-                    closest_weather.get('ocean_current_direction_deg', 180),
-                    closest_weather.get('temperature_c', 20),
-                    closest_weather.get('humidity_percent', 60)
-                ]])
-                
-                # Scale features and predict optimal speed
-                features_scaled = scaler.transform(features)
-                predicted_speed = model.predict(features_scaled)[0]
-                
-                # Weight = distance / speed (lower is better)
-                weight = dist / max(predicted_speed, 0.1)
-                
-                G.add_edge(i, j, weight=weight)
-        
-        # Find shortest path
-        path = nx.shortest_path(G, 0, len(waypoints) - 1, weight='weight')
+        # Waypoints are colinear, so only forward edges to the next few
+        # successors are useful: a banded DAG instead of a complete graph
+        edges = [
+            (i, j)
+            for i in range(num_waypoints - 1)
+            for j in range(i + 1, min(i + 1 + ROUTE_MAX_HOP, num_waypoints))
+        ]
+        
+        # Weather lookup arrays, extracted once instead of copying the frame per edge
+        weather_defaults = {
+            'wave_height_m': 1,
+            'wind_speed_ms': 5,
+            'ocean_current_velocity_ms': 0.5,
+            'ocean_current_direction_deg': 180,
+            'temperature_c': 20,
+            'humidity_percent': 60
+        }
+        if not weather_df.empty:
+            wvals = np.column_stack([
+                weather_df[col].to_numpy(dtype=float) if col in weather_df.columns
+                else np.full(len(weather_df), default, dtype=float)
+                for col, default in weather_defaults.items()
+            ])
+        else:
+            wvals = np.array([list(weather_defaults.values())], dtype=float)
+        has_position = {'latitude', 'longitude'}.issubset(weather_df.columns)
+        if has_position:
+            wlat = weather_df['latitude'].to_numpy(dtype=float)
+            wlon = weather_df['longitude'].to_numpy(dtype=float)
+        
+        rows, cols = np.array(edges).T
+        
+        # Great-circle distance between every pair of waypoints, then gather the edges
+        distances = haversine_nm(lats[:, None], lons[:, None], lats[None, :], lons[None, :])[rows, cols]
+        
+        # Weather conditions at each edge midpoint
+        mid_lats = (lats[rows] + lats[cols]) / 2
+        mid_lons = (lons[rows] + lons[cols]) / 2
+        
+        # Find closest weather data for all midpoints at once
+        if has_position:
+            idx = np.argmin((wlat[None, :] - mid_lats[:, None])**2 +
+                            (wlon[None, :] - mid_lons[:, None])**2, axis=1)
+        else:
+            idx = np.zeros(len(edges), dtype=int)
+        
+        # Feature matrix for prediction (default speed and course)
+        features = np.column_stack([
+            mid_lats, mid_lons,
+            np.full(len(edges), 10), np.zeros(len(edges)),
+            wvals[idx]
+        ]).astype(np.float32)
+        
+        # Scale features and predict optimal speed for every edge at once
+        predicted_speeds = model.predict(scaler.transform(features))
+        
+        # Weight = distance / speed (lower is better)
+        weights = distances / np.maximum(predicted_speeds, 0.1)
+        
+        # Sparse weight matrix straight from the edge arrays
+        graph = csr_matrix((weights, (rows, cols)), shape=(num_waypoints, num_waypoints))
+        
+        # Find shortest path and walk the predecessors back from the destination
+        _, predecessors = dijkstra(graph, indices=0, return_predecessors=True)
+        path = [num_waypoints - 1]
+        while path[-1] != 0:
+            path.append(predecessors[path[-1]])
+        path.reverse()
         optimized_route = [waypoints[i] for i in path]
         
         print(f"✓ Generated optimized route with {len(optimized_route)} waypoints")
@@ -596,36 +732,40 @@ def main():
     print("🚢 MARITIME ROUTE OPTIMIZATION DEMO APPLICATION")
     print("=" * 60)
     
-    # Step 1: Setup database
-    print("\n1. Setting up database...")
-    setup_database()
-    
-    # Step 2: Create sample AIS data
-    print("\n2. Creating sample AIS vessel data...")
-    ais_data = create_sample_ais_data()
-    print(f"✓ Created {len(ais_data)} sample vessels")
-    
-    # Step 3: Collect weather data
-    print("\n3. Collecting weather data...")
-    open_meteo_data = fetch_open_meteo_weather(TEST_LAT, TEST_LON, hours=24)
-    tomorrow_data = fetch_tomorrow_io_weather(TEST_LAT, TEST_LON, TOMORROW_IO_API_KEY, hours=24)
-    
-    # Step 4: Combine and store data
-    print("\n4. Organizing data...")
-    combined_weather = combine_weather_data(open_meteo_data, tomorrow_data)
-    store_weather_data(combined_weather)
-    store_ais_data(ais_data)
+    # One connection shared by every database step of the demo
+    with closing(connect_database()) as conn:
+        # Step 1: Setup database
+        print("\n1. Setting up database...")
+        setup_database(conn)
+        
+        # Step 2: Create sample AIS data
+        print("\n2. Creating sample AIS vessel data...")
+        ais_data = create_sample_ais_data()
+        print(f"✓ Created {len(ais_data)} sample vessels")
+        
+        # Step 3: Collect weather data
+        print("\n3. Collecting weather data...")
+        open_meteo_data, tomorrow_data = fetch_weather_concurrently(
+            TEST_LAT, TEST_LON, TOMORROW_IO_API_KEY, hours=24
+        )
+        
+        # Step 4: Combine and store data
+        print("\n4. Organizing data...")
+        combined_weather = combine_weather_data(open_meteo_data, tomorrow_data)
+        store_weather_data(combined_weather, conn)
+        store_ais_data(ais_data, conn)
+        
+        # Step 5: Analyze data
+        print("\n5. Investigating patterns...")
+        weather_df, ais_df = load_data_from_db(conn)
     
-    # Step 5: Analyze data
-    print("\n5. Investigating patterns...")
-    weather_df, ais_df = load_data_from_db()
     compute_averages(weather_df, ais_df)
     plot_vessel_positions(ais_df, weather_df)
     
     # Step 6: Route optimization
     print("\n6. Optimizing routes with ML...")
     X, y = prepare_ml_data(weather_df, ais_df)
-    model, scaler = train_route_optimization_model(X, y)
+    model, scaler = load_or_train_model(X, y, retrain='--retrain' in sys.argv[1:])
     
     # Generate sample optimized route
     start_lat, start_lon = 37.2, -122.8  # Near San Francisco
@@ -638,6 +778,7 @@ def main():
     print("\n🎉 Demo complete! Check the generated plots and database.")
     print("📊 Generated files:")
     print("  - maritime_demo.db (database)")
+    print(f"  - {MODEL_CACHE_PATH} (cached ML model; run with --retrain to refresh)")
     print("  - maritime_analysis_demo.png (vessel positions & weather)")
     print("  - optimized_route_demo.png (ML-optimized route)")
 
@@ -5,47 +5,169 @@ Maritime Route Optimization Package
 Professional maritime route optimization and weather intelligence platform.
 """
 
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
 # Import main classes
 from .main import MaritimeRouteOptimizer
 from .core.models import (
     RouteObjective, RouteConstraints, VesselData, WeatherData, 
-    Waypoint, Route, RouteOptimizationResult, NavigationParameters, PerformanceMetrics,
-    MaritimeUnits
+    Waypoint, Route, RouteArrays, RouteOptimizationResult, NavigationParameters, PerformanceMetrics,
+    MaritimeUnits, KNOTS_TO_KMH, KMH_TO_KNOTS, M_TO_FT, FT_TO_M
 )
 from .data.collectors.ais_collector import AISDataCollector
 from .data.processors.ml_processor import MaritimeMLDataProcessor
 from .routing.route_optimizer import EnhancedSailingCalculator
-from .utils.database import DatabaseManager
-from .utils.visualization import MaritimeVisualizer
+from .utils.database import DatabaseManager, get_database_manager
+from .utils.visualization import MaritimeVisualizer, reusable_figure, show_figure
 from .config.settings import settings # Import settings
 
+# orjson decodes the long hourly float arrays much faster (graceful fallback if unavailable)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+else:
+    import json
+    _json_loads = json.loads
+
+# Shared keep-alive HTTP session for weather API calls
+_HTTP_SESSION = None
+HTTP_TIMEOUT = (3, 10)  # (connect, read) seconds
+HTTP_MAX_RESPONSE_BYTES = 5_000_000  # refuse bodies larger than this before JSON decoding
+MAX_FORECAST_HOURS = 720
+
+def _get_http_session():
+    """Return the shared requests.Session, creating it on first use"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                              max_retries=Retry(total=3, backoff_factor=0.3))
+        session.mount("https://", adapter)
+        _HTTP_SESSION = session
+    return _HTTP_SESSION
+
+def _get_json(url, params):
+    """GET url and decode the JSON body, refusing responses over HTTP_MAX_RESPONSE_BYTES"""
+    with _get_http_session().get(url, params=params, timeout=HTTP_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        if int(response.headers.get('Content-Length') or 0) > HTTP_MAX_RESPONSE_BYTES:
+            raise ValueError(f"response too large ({response.headers['Content-Length']} bytes)")
+        
+        # Chunked responses carry no length header, so also count bytes as they arrive
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=65536):
+            body += chunk
+            if len(body) > HTTP_MAX_RESPONSE_BYTES:
+                raise ValueError(f"response exceeded {HTTP_MAX_RESPONSE_BYTES} bytes")
+    return _json_loads(body)
+
+def _check_forecast_hours(hours):
+    """Reject forecast horizons outside 1..MAX_FORECAST_HOURS before any request is made"""
+    if not 1 <= int(hours) <= MAX_FORECAST_HOURS:
+        raise ValueError(f"hours must be between 1 and {MAX_FORECAST_HOURS}, got {hours}")
+
+# Recent weather API responses keyed by source, rounded position and horizon (LRU + TTL)
+_WEATHER_CACHE = OrderedDict()
+_WEATHER_CACHE_MAXSIZE = 256
+_WEATHER_CACHE_LOCK = threading.Lock()  # web_app serves requests from worker threads
+
+def _position_key(lat, lon):
+    """Cache key for one point or a batch of points, rounded to ~0.01 deg (about 0.6 nm)"""
+    import numpy as np
+    return (np.ndim(lat),
+            tuple(np.round(np.atleast_1d(lat), 2).tolist()),
+            tuple(np.round(np.atleast_1d(lon), 2).tolist()))
+
+def _cached_weather(key, fetch):
+    """Return a fresh copy of the cached frame for key, or fetch and cache it"""
+    now = time.monotonic()
+    with _WEATHER_CACHE_LOCK:
+        hit = _WEATHER_CACHE.get(key)
+        if hit is not None and hit[0] > now:
+            _WEATHER_CACHE.move_to_end(key)
+            return hit[1].copy()
+
+    # The request itself runs outside the lock; a concurrent miss on the same key just fetches twice
+    df = fetch()
+    if not df.empty:  # never cache a failed fetch
+        entry = (now + settings.WEATHER_CACHE_TTL, df.copy())
+        with _WEATHER_CACHE_LOCK:
+            _WEATHER_CACHE[key] = entry
+            _WEATHER_CACHE.move_to_end(key)
+            while len(_WEATHER_CACHE) > _WEATHER_CACHE_MAXSIZE:
+                _WEATHER_CACHE.popitem(last=False)
+    return df
+
 # Weather API functions (stub implementations)
+def _open_meteo_frame(hourly_data):
+    """Build the Open-Meteo DataFrame for one point's hourly series"""
+    import numpy as np
+    import pandas as pd
+    
+    # Open-Meteo returns fixed ISO 'YYYY-MM-DDTHH:MM' stamps, which NumPy parses natively
+    times = np.asarray(hourly_data.get('time', []), dtype='datetime64[m]')
+    
+    def column(name):
+        # JSON list straight to float32 (null becomes NaN); a missing variable is all-NaN
+        if name not in hourly_data:
+            return np.full(len(times), np.nan, dtype=np.float32)
+        return np.asarray(hourly_data[name], dtype=np.float32)
+    
+    return pd.DataFrame({
+        'time': pd.DatetimeIndex(times),
+        'wave_height_m': column('wave_height'),
+        'wave_direction_deg': column('wave_direction'),
+        'wind_wave_height_m': column('wind_wave_height'),
+        'ocean_current_velocity_ms': column('ocean_current_velocity'),
+        'ocean_current_direction_deg': column('ocean_current_direction')
+    })
+
 def fetch_open_meteo_weather(lat, lon, hours=24):
-    """Fetch weather from Open-Meteo API"""
-    import requests
+    """Fetch weather from Open-Meteo API for one point or a batch of points in one request"""
+    _check_forecast_hours(hours)  # outside the fetcher's try: a bad horizon reaches the caller
+    key = ('open_meteo', _position_key(lat, lon), hours)
+    return _cached_weather(key, lambda: _fetch_open_meteo_weather(lat, lon, hours))
+
+def _fetch_open_meteo_weather(lat, lon, hours):
+    """Uncached Open-Meteo request"""
+    import numpy as np
     import pandas as pd
     try:
+        batched = np.ndim(lat) > 0
+        lats, lons = np.atleast_1d(lat).tolist(), np.atleast_1d(lon).tolist()
         url = "https://marine-api.open-meteo.com/v1/marine"
         params = {
-            "latitude": lat,
-            "longitude": lon,
+            "latitude": ",".join(map(str, lats)),
+            "longitude": ",".join(map(str, lons)),
             "hourly": ["wave_height", "wave_direction", "wind_wave_height", 
                       "ocean_current_velocity", "ocean_current_direction"],
             "forecast_hours": hours
         }
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        hourly_data = data.get('hourly', {})
-        
-        df = pd.DataFrame({
-            'time': pd.to_datetime(hourly_data.get('time', [])),
-            'wave_height_m': hourly_data.get('wave_height', []),
-            'wave_direction_deg': hourly_data.get('wave_direction', []),
-            'wind_wave_height_m': hourly_data.get('wind_wave_height', []),
-            'ocean_current_velocity_ms': hourly_data.get('ocean_current_velocity', []),
-            'ocean_current_direction_deg': hourly_data.get('ocean_current_direction', [])
-        })
+        data = _get_json(url, params)
+
+        # Multiple coordinates come back as a list with one series per point
+        series = data if isinstance(data, list) else [data]
+        frames = [_open_meteo_frame(point.get('hourly', {})) for point in series]
+        if not batched:
+            return frames[0]
+
+        df = pd.concat(frames, keys=range(len(frames)), names=['point_id'])
+        df = df.reset_index(level='point_id').reset_index(drop=True)
+        # Positions stay float64 (float32 rounds 37.7749 to 37.774898); only readings are float32
+        df['latitude'] = np.asarray(lats, dtype=np.float64)[df['point_id']]
+        df['longitude'] = np.asarray(lons, dtype=np.float64)[df['point_id']]
         return df
     except Exception as e:
         print(f"Error fetching Open-Meteo data: {e}")
@@ -53,7 +175,13 @@ def fetch_open_meteo_weather(lat, lon, hours=24):
 
 def fetch_tomorrow_io_weather(lat, lon, api_key, hours=24):
     """Fetch weather from Tomorrow.io API"""
-    import requests
+    _check_forecast_hours(hours)  # outside the fetcher's try: a bad horizon reaches the caller
+    key = ('tomorrow_io', _position_key(lat, lon), hours)
+    return _cached_weather(key, lambda: _fetch_tomorrow_io_weather(lat, lon, api_key, hours))
+
+def _fetch_tomorrow_io_weather(lat, lon, api_key, hours):
+    """Uncached Tomorrow.io request"""
+    import numpy as np
     import pandas as pd
     try:
         url = f"https://api.tomorrow.io/v4/timelines"
@@ -65,16 +193,14 @@ def fetch_tomorrow_io_weather(lat, lon, api_key, hours=24):
             "units": "metric",
             "apikey": api_key
         }
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = _get_json(url, params)
         intervals = data.get('data', {}).get('timelines', [{}])[0].get('intervals', [])
         
         weather_data = []
         for interval in intervals[:hours]:
             values = interval.get('values', {})
             weather_data.append({
-                'time': pd.to_datetime(interval.get('startTime')),
+                'time': interval.get('startTime'),
                 'temperature_c': values.get('temperature'),
                 'wind_speed_ms': values.get('windSpeed'),
                 'precipitation_intensity': values.get('precipitationIntensity'),
@@ -83,81 +209,73 @@ def fetch_tomorrow_io_weather(lat, lon, api_key, hours=24):
                 'sea_current_speed_ms': values.get('seaCurrentSpeed'),
                 'sea_current_direction_deg': values.get('seaCurrentDirection')
             })
-        return pd.DataFrame(weather_data)
+        df = pd.DataFrame(weather_data)
+        if not df.empty:
+            df['time'] = pd.to_datetime(df['time'])  # parse the whole column once
+            # Readings as float32 (missing values become NaN rather than object None)
+            values = df.columns.drop('time')
+            df[values] = df[values].apply(pd.to_numeric, errors='coerce').astype(np.float32)
+        return df
     except Exception as e:
         print(f"Error fetching Tomorrow.io data: {e}")
         return pd.DataFrame()
 
+@lru_cache(maxsize=1)
+def _sample_weather_template():
+    """Sample weather readings (built once; timestamps are attached per call)"""
+    import pandas as pd
+    import numpy as np
+    
+    # One 1-D array per column, so each column stays contiguous (float64 positions, float32 readings)
+    def uniform(low, high):
+        return np.random.uniform(low, high, 24).astype(np.float32)
+    
+    return pd.DataFrame({
+        'latitude': np.full(24, 37.5),
+        'longitude': np.full(24, -122.5),
+        'wave_height_m': uniform(0.5, 3.0),
+        'wind_speed_kts': uniform(5, 25),
+        'wind_direction_deg': uniform(0, 360),
+        'temperature_c': uniform(15, 25),
+        'ocean_current_speed_kts': uniform(0.2, 2.0),
+        'ocean_current_direction_deg': uniform(0, 360),
+    })
+
+@lru_cache(maxsize=1)
+def _sample_ais_template():
+    """Sample vessel positions (built once; timestamps are attached per call)"""
+    import pandas as pd
+    import numpy as np
+    return pd.DataFrame({
+        'mmsi': np.array([123456789, 987654321, 456789123], dtype=np.int64),
+        'name': ['Cargo Ship Alpha', 'Tanker Beta', 'Ferry Gamma'],
+        'latitude': np.array([37.7749, 37.7849, 37.7649]),
+        'longitude': np.array([-122.4194, -122.4094, -122.4294]),
+        'speed': np.array([12.5, 8.2, 15.8], dtype=np.float32),
+        'course': np.array([45.0, 90.0, 180.0], dtype=np.float32),
+        'heading': np.array([45.0, 90.0, 180.0], dtype=np.float32),
+    })
+
 def load_data_from_db():
     """Load data from database"""
     import pandas as pd
-    import numpy as np
-    from datetime import datetime, timedelta
-    
-    db = DatabaseManager()
-    weather_data = db.get_weather_forecast(37.5, -122.5, 24)
-    ais_data = db.get_recent_vessels(10)
-    
-    # Convert to DataFrames if they're lists
-    if isinstance(weather_data, list):
-        if weather_data:
-            # Convert list of WeatherData objects to DataFrame
-            weather_dicts = []
-            for w in weather_data:
-                weather_dicts.append({
-                    'latitude': w.latitude,
-                    'longitude': w.longitude,
-                    'wave_height_m': w.wave_height_m,
-                    'wind_speed_kts': w.wind_speed_kts,
-                    'wind_direction_deg': w.wind_direction_deg,
-                    'temperature_c': w.temperature_c,
-                    'ocean_current_speed_kts': w.ocean_current_speed_kts,
-                    'ocean_current_direction_deg': w.ocean_current_direction_deg,
-                    'timestamp': w.timestamp
-                })
-            weather_data = pd.DataFrame(weather_dicts)
-        else:
-            # Create sample weather data
-            weather_data = pd.DataFrame({
-                'latitude': [37.5] * 24,
-                'longitude': [-122.5] * 24,
-                'wave_height_m': np.random.uniform(0.5, 3.0, 24),
-                'wind_speed_kts': np.random.uniform(5, 25, 24),
-                'wind_direction_deg': np.random.uniform(0, 360, 24),
-                'temperature_c': np.random.uniform(15, 25, 24),
-                'ocean_current_speed_kts': np.random.uniform(0.2, 2.0, 24),
-                'ocean_current_direction_deg': np.random.uniform(0, 360, 24),
-                'timestamp': [datetime.now() + timedelta(hours=i) for i in range(24)]
-            })
+    from datetime import datetime
     
-    if isinstance(ais_data, list):
-        if ais_data:
-            # Convert list of VesselData objects to DataFrame
-            vessel_dicts = []
-            for v in ais_data:
-                vessel_dicts.append({
-                    'mmsi': v.mmsi,
-                    'name': v.name,
-                    'latitude': v.latitude,
-                    'longitude': v.longitude,
-                    'speed': v.speed,
-                    'course': v.course,
-                    'heading': v.heading,
-                    'timestamp': v.timestamp
-                })
-            ais_data = pd.DataFrame(vessel_dicts)
-        else:
-            # Create sample AIS data
-            ais_data = pd.DataFrame({
-                'mmsi': [123456789, 987654321, 456789123],
-                'name': ['Cargo Ship Alpha', 'Tanker Beta', 'Ferry Gamma'],
-                'latitude': [37.7749, 37.7849, 37.7649],
-                'longitude': [-122.4194, -122.4094, -122.4294],
-                'speed': [12.5, 8.2, 15.8],
-                'course': [45.0, 90.0, 180.0],
-                'heading': [45.0, 90.0, 180.0],
-                'timestamp': [datetime.now()] * 3
-            })
+    db = get_database_manager()
+    # Project only the columns used downstream and stream them straight into DataFrames
+    weather_data = db.get_weather_forecast_df(37.5, -122.5, 24)
+    ais_data = db.get_recent_vessels_df(10)
+    
+    # Sample fallbacks: assign() returns a new frame sharing the template's column arrays
+    if weather_data.empty:
+        # Create sample weather data
+        weather_data = _sample_weather_template().assign(
+            timestamp=pd.date_range(datetime.now(), periods=24, freq='h'))
+    
+    if ais_data.empty:
+        # Create sample AIS data
+        ais_data = _sample_ais_template().assign(
+            timestamp=pd.DatetimeIndex([datetime.now()] * 3))
     
     return weather_data, ais_data
 
@@ -166,125 +284,222 @@ def optimize_route(start_lat, start_lon, end_lat, end_lon, model, scaler, weathe
     calc = EnhancedSailingCalculator(settings)
     waypoints = calc.generate_waypoints(start_lat, start_lon, end_lat, end_lon, 15)
     
-    # Apply land avoidance to generated waypoints
+    # Final land check: the restricted-area, depth, hazard and TSS passes in generate_waypoints
+    # run after its land pass and can move waypoints back into the offing buffer
     waypoints = calc.avoid_land_waypoints(waypoints)
     
     return [(wp.latitude, wp.longitude) for wp in waypoints]
 
+# Vessel state columns used as ML features (0 when a column is missing)
+ML_VESSEL_FEATURES = ['latitude', 'longitude', 'speed', 'course']
+
 def prepare_ml_data(weather_data, ais_data):
     """Prepare data for ML training"""
+    import numpy as np
+    
     if weather_data.empty or ais_data.empty:
         return None, None
     
-    # Simple feature preparation
-    features = []
-    targets = []
-    
-    for idx, vessel in ais_data.iterrows():
-        feature_vector = [
-            vessel.get('latitude', 0),
-            vessel.get('longitude', 0),
-            vessel.get('speed', 0),
-            vessel.get('course', 0)
-        ]
-        features.append(feature_vector)
-        targets.append(vessel.get('speed', 10))  # Target: optimal speed
+    # Simple feature preparation, column-wise
+    features = ais_data.reindex(columns=ML_VESSEL_FEATURES, fill_value=0).to_numpy(dtype=np.float64)
+    # Target: optimal speed (observed speed; 10 when the column is missing)
+    if 'speed' in ais_data.columns:
+        targets = ais_data['speed'].to_numpy(dtype=np.float64)
+    else:
+        targets = np.full(len(ais_data), 10.0)
     
+    return features, targets
+
+# Fitted (fingerprint, model, scaler) per cache file, so repeat calls skip both fit and reload
+_ROUTE_MODEL_CACHE = {}
+
+def _training_fingerprint(X, y):
+    """Digest of the training arrays, used to tell whether a cached model still applies"""
+    import hashlib
     import numpy as np
-    return np.array(features), np.array(targets)
+    digest = hashlib.sha1()
+    for arr in (X, y):
+        arr = np.ascontiguousarray(arr, dtype=np.float64)
+        digest.update(str(arr.shape).encode())
+        digest.update(arr.tobytes())
+    return digest.hexdigest()
 
-def train_route_optimization_model(X, y):
-    """Train ML model for route optimization"""
+def train_route_optimization_model(X, y, cache_path=None):
+    """Train ML model for route optimization (reusing the model cached under cache_path if the data matches)"""
+    import os
+    import joblib
     from sklearn.ensemble import RandomForestRegressor
     from sklearn.preprocessing import StandardScaler
     
     if X is None or y is None:
         return None, None
     
+    cache_file = os.path.join(cache_path, 'route_model.joblib') if cache_path else None
+    fingerprint = _training_fingerprint(X, y) if cache_file else None
+    if cache_file:
+        cached = _ROUTE_MODEL_CACHE.get(cache_file)
+        if cached is None and os.path.exists(cache_file):
+            try:
+                # Loaded fully into memory: a memory map would go stale when a retrain rewrites the file
+                cached = joblib.load(cache_file)
+                _ROUTE_MODEL_CACHE[cache_file] = cached
+            except Exception as e:
+                print(f"⚠️  Could not load cached route model: {e}")
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1], cached[2]
+    
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
     
-    model = RandomForestRegressor(n_estimators=100, random_state=settings.RANDOM_STATE)
+    # Histogram-based gradient boosting when LightGBM is installed (graceful fallback if unavailable)
+    try:
+        from lightgbm import LGBMRegressor
+        model = LGBMRegressor(n_estimators=100, num_leaves=31, n_jobs=-1,
+                              random_state=settings.RANDOM_STATE, verbose=-1)
+    except ImportError:
+        model = RandomForestRegressor(n_estimators=100, n_jobs=-1, random_state=settings.RANDOM_STATE)
     model.fit(X_scaled, y)
     
+    if cache_file:
+        try:
+            os.makedirs(cache_path, exist_ok=True)
+            joblib.dump((fingerprint, model, scaler), cache_file, compress=0)
+            _ROUTE_MODEL_CACHE[cache_file] = (fingerprint, model, scaler)
+        except Exception as e:
+            print(f"⚠️  Could not cache route model: {e}")
+    
     return model, scaler
 
 def combine_weather_data(open_meteo, tomorrow):
     """Combine weather data from both sources"""
     import pandas as pd
     
-    if open_meteo.empty and tomorrow.empty:
-        return pd.DataFrame()
-    if open_meteo.empty:
+    # Hand back whichever side has data as-is (no new frame, no time conversion)
+    if tomorrow is None or tomorrow.empty:
+        return open_meteo if open_meteo is not None else pd.DataFrame()
+    if open_meteo is None or open_meteo.empty:
         return tomorrow
-    if tomorrow.empty:
-        return open_meteo
     
-    # Simple merge on time
-    open_meteo['time'] = pd.to_datetime(open_meteo['time']).dt.tz_localize(None)
-    tomorrow['time'] = pd.to_datetime(tomorrow['time']).dt.tz_localize(None)
+    def time_indexed(df):
+        # Naive DatetimeIndex on 'time' (fetchers already return datetime64; only parse if not)
+        times = df['time']
+        if not pd.api.types.is_datetime64_any_dtype(times):
+            times = pd.to_datetime(times)
+        if times.dt.tz is not None:
+            times = times.dt.tz_localize(None)
+        return df.drop(columns='time').set_index(pd.DatetimeIndex(times, name='time'))
     
-    combined = pd.merge(open_meteo, tomorrow, on='time', how='outer', suffixes=('_openmeteo', '_tomorrow'))
-    return combined
+    a = time_indexed(open_meteo)
+    b = time_indexed(tomorrow)
+    
+    # Only columns present in both sources need a source suffix
+    shared = a.columns.intersection(b.columns)
+    a = a.rename(columns={col: f'{col}_openmeteo' for col in shared})
+    b = b.rename(columns={col: f'{col}_tomorrow' for col in shared})
+    
+    # Index-aligned outer join on the hourly time axis. A batched Open-Meteo frame repeats each
+    # hour once per point, so the join is many-to-one there (concat would raise on those hours)
+    combined = a.join(b, how='outer').sort_index(kind='stable')
+    return combined.reset_index()
 
 def store_weather_data(weather_data):
     """Store weather data in database"""
-    db = DatabaseManager()
-    if not weather_data.empty:
-        for _, row in weather_data.iterrows():
-            weather = WeatherData(
-                latitude=row.get('latitude', 37.5),
-                longitude=row.get('longitude', -122.5),
-                wave_height_m=row.get('wave_height_m', 1.0),
-                wind_speed_kts=row.get('wind_speed_ms', 5.0) * 1.944,  # Convert m/s to knots
-                wind_direction_deg=row.get('wind_direction_deg', 180.0),
-                temperature_c=row.get('temperature_c', 20.0),
-                ocean_current_speed_kts=row.get('ocean_current_velocity_ms', 0.5) * 1.944,
-                ocean_current_direction_deg=row.get('ocean_current_direction_deg', 180.0)
-            )
-            db.save_weather_data([weather])
+    # Nothing to write: skip opening (and schema-checking) the database
+    if weather_data is None or weather_data.empty:
+        return True
+    import numpy as np
+    
+    def column(name, default):
+        # Whole column as float64 (default when the source didn't provide it)
+        if name in weather_data.columns:
+            return weather_data[name].to_numpy(dtype=np.float64)
+        return np.full(len(weather_data), default)
+    
+    # Unit conversions on whole arrays: m/s to knots
+    wind_kts = column('wind_speed_ms', 5.0) * 1.944
+    current_kts = column('ocean_current_velocity_ms', 0.5) * 1.944
+    
+    records = [
+        WeatherData(
+            latitude=lat,
+            longitude=lon,
+            wave_height_m=wave,
+            wind_speed_kts=wind,
+            wind_direction_deg=wind_dir,
+            temperature_c=temp,
+            ocean_current_speed_kts=current,
+            ocean_current_direction_deg=current_dir
+        )
+        for lat, lon, wave, wind, wind_dir, temp, current, current_dir in zip(
+            column('latitude', 37.5).tolist(),
+            column('longitude', -122.5).tolist(),
+            column('wave_height_m', 1.0).tolist(),
+            wind_kts.tolist(),
+            column('wind_direction_deg', 180.0).tolist(),
+            column('temperature_c', 20.0).tolist(),
+            current_kts.tolist(),
+            column('ocean_current_direction_deg', 180.0).tolist()
+        )
+    ]
+    get_database_manager().save_weather_data(records)
     return True
 
 def store_ais_data(ais_data):
     """Store AIS data in database"""
-    db = DatabaseManager()
-    if ais_data:
-        for vessel in ais_data:
-            vessel_data = VesselData(
-                mmsi=vessel.get('mmsi', 0),
-                name=vessel.get('name', 'Unknown'),
-                latitude=vessel.get('latitude', 0),
-                longitude=vessel.get('longitude', 0),
-                speed=vessel.get('speed', 0),
-                course=vessel.get('course', 0),
-                heading=vessel.get('heading', 0),
-                timestamp=vessel.get('timestamp', '2024-01-01T00:00:00')
-            )
-            db.save_vessel_data([vessel_data])
+    import pandas as pd
+    
+    # Nothing to write: skip opening (and schema-checking) the database
+    if ais_data is None or len(ais_data) == 0:
+        return True
+    db = get_database_manager()
+    if isinstance(ais_data, pd.DataFrame):
+        # Frame rows go straight to executemany, no per-row dict or VesselData
+        db.save_vessel_frame(ais_data)
+        return True
+    if isinstance(ais_data[0], VesselData):
+        # Already-built records (e.g. from AISDataCollector)
+        db.save_vessel_data(ais_data)
+        return True
+    # Build every record first, then insert them in one batched (executemany) call
+    records = [
+        VesselData(
+            mmsi=vessel.get('mmsi', 0),
+            name=vessel.get('name', 'Unknown'),
+            latitude=vessel.get('latitude', 0),
+            longitude=vessel.get('longitude', 0),
+            speed=vessel.get('speed', 0),
+            course=vessel.get('course', 0),
+            heading=vessel.get('heading', 0),
+            timestamp=vessel.get('timestamp', '2024-01-01T00:00:00')
+        )
+        for vessel in ais_data
+    ]
+    db.save_vessel_data(records)
     return True
 
 def setup_database():
     """Setup database tables"""
-    db = DatabaseManager()
+    db = get_database_manager()
     return True
 
-def plot_optimized_route(route, vessels):
+def plot_optimized_route(route, vessels, save_path=None):
     """Plot optimized route"""
+    import numpy as np
     import matplotlib.pyplot as plt
     
     if not route:
         return
     
-    plt.figure(figsize=(10, 8))
+    fig = reusable_figure('optimized_route', figsize=(10, 8))
     
-    # Plot route
-    route_lats, route_lons = zip(*route)
-    plt.plot(route_lons, route_lats, 'b-', linewidth=3, alpha=0.8, label='Optimized Route')
-    plt.scatter(route_lons, route_lats, c='blue', s=100, alpha=1.0, label='Waypoints')
+    # Plot route: track and waypoint markers as one line artist, from an (N, 2) lat/lon array
+    points = np.asarray(route, dtype=np.float64)
+    plt.plot(points[:, 1], points[:, 0], 'b-o', linewidth=3, markersize=10, alpha=0.8,
+             label='Optimized Route')
     
     # Plot vessels if available
-    if vessels and not vessels.empty:
-        plt.scatter(vessels['longitude'], vessels['latitude'], 
+    if vessels is not None and not vessels.empty:
+        plt.scatter(vessels['longitude'].to_numpy(), vessels['latitude'].to_numpy(),
                    c='red', s=50, alpha=0.6, label='Vessels')
     
     plt.title('Optimized Maritime Route')
@@ -292,7 +507,9 @@ def plot_optimized_route(route, vessels):
     plt.ylabel('Latitude')
     plt.legend()
     plt.grid(True, alpha=0.3)
-    plt.show()
+    if save_path:
+        fig.savefig(save_path, dpi=settings.PLOT_DPI, bbox_inches='tight')
+    show_figure(fig)
 
 def compute_averages(weather_data, ais_data):
     """Compute data averages"""
@@ -301,11 +518,10 @@ def compute_averages(weather_data, ais_data):
     
     if not weather_data.empty:
         print("\n🌊 WEATHER CONDITIONS:")
-        numeric_cols = weather_data.select_dtypes(include=['number']).columns
-        for col in numeric_cols:
-            if weather_data[col].notna().any():
-                avg_val = weather_data[col].mean()
-                print(f"  Average {col}: {avg_val:.2f}")
+        # One reduction over all numeric columns; all-NaN columns come back NaN and are dropped
+        means = weather_data.select_dtypes(include=['number']).mean()
+        for col, avg_val in means.dropna().items():
+            print(f"  Average {col}: {avg_val:.2f}")
     
     if not ais_data.empty:
         print("\n🚢 VESSEL ACTIVITY:")
@@ -314,27 +530,33 @@ def compute_averages(weather_data, ais_data):
             avg_speed = ais_data['speed'].mean()
             print(f"  Average vessel speed: {avg_speed:.2f} knots")
 
-def plot_vessel_positions(ais_data, weather_data):
+def plot_vessel_positions(ais_data, weather_data, save_path=None):
     """Plot vessel positions"""
+    import numpy as np
     import matplotlib.pyplot as plt
     
     if ais_data.empty:
         print("No AIS data to plot")
         return
     
-    plt.figure(figsize=(12, 8))
-    scatter = plt.scatter(
-        ais_data['longitude'], 
-        ais_data['latitude'],
-        c=ais_data.get('speed', 10),
-        cmap='viridis',
-        s=100,
-        alpha=0.7
-    )
+    fig = reusable_figure('vessel_positions', figsize=(12, 8))
+    lons = ais_data['longitude'].to_numpy(dtype=np.float64)
+    lats = ais_data['latitude'].to_numpy(dtype=np.float64)
+    speeds = (ais_data['speed'].to_numpy(dtype=np.float64) if 'speed' in ais_data.columns
+              else np.full(len(ais_data), 10.0))
+    
+    if len(ais_data) <= settings.PLOT_SCATTER_MAX_POINTS:
+        mappable = plt.scatter(lons, lats, c=speeds, cmap='viridis', s=100, alpha=0.7)
+    else:
+        # One hexagon per occupied cell (mean speed) instead of one marker path per vessel
+        mappable = plt.hexbin(lons, lats, C=speeds, reduce_C_function=np.mean,
+                              gridsize=80, cmap='viridis', mincnt=1)
     
     plt.title('Vessel Positions (Colored by Speed)')
     plt.xlabel('Longitude')
     plt.ylabel('Latitude')
-    plt.colorbar(scatter, label='Speed (knots)')
+    plt.colorbar(mappable, label='Speed (knots)')
     plt.grid(True, alpha=0.3)
-    plt.show()
+    if save_path:
+        fig.savefig(save_path, dpi=settings.PLOT_DPI, bbox_inches='tight')
+    show_figure(fig)
@@ -4,14 +4,101 @@ Fetches TSS, AtoN, and other maritime features from NOAA's Direct-to-GIS service
 """
 import requests
 import json
+import mmap
+import numpy as np
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partialmethod
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Iterator
 import logging
 # from ..config.settings import settings # Remove this relative import
 
+# Optional incremental JSON parser for large ENC layers (graceful fallback if unavailable)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Optional fast JSON encoder for the chart outputs (graceful fallback if unavailable)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+
+def _write_json(obj: Any, path: Path):
+    """Write obj to path as indented JSON (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        path.write_text(json.dumps(obj, indent=2))
+
+
+def _iter_positions(coordinates) -> Iterator[Tuple[float, float]]:
+    """Every (x, y) position in a GeoJSON coordinates array, at any nesting depth"""
+    if coordinates and isinstance(coordinates[0], (int, float)):
+        yield coordinates[0], coordinates[1]
+    else:
+        for part in coordinates or ():
+            yield from _iter_positions(part)
+
+
+def _feature_bbox(feature: Dict[str, Any]) -> Tuple[float, float, float, float]:
+    """(minx, miny, maxx, maxy) of a feature's geometry; NaNs when it has no coordinates"""
+    geometry = feature.get("geometry") or {}
+    parts = geometry.get("geometries") or [geometry]
+    positions = [pos for part in parts for pos in _iter_positions(part.get("coordinates"))]
+    if not positions:
+        return (np.nan,) * 4
+    xy = np.asarray(positions, dtype=np.float64)
+    return (*xy.min(axis=0), *xy.max(axis=0))
+
+
+def _region_mask(bboxes: np.ndarray, region_bbox: Tuple[float, float, float, float]) -> np.ndarray:
+    """Rows of an (n, 4) float32 bbox array that meet region_bbox; features without geometry always do"""
+    west, south, east, north = region_bbox
+    return ((bboxes[:, 0] <= east) & (bboxes[:, 2] >= west) &
+            (bboxes[:, 1] <= north) & (bboxes[:, 3] >= south)) | np.isnan(bboxes[:, 0])
+
+
+def _index_paths(layer_path: Path) -> Tuple[Path, Path]:
+    """Sidecar files of an NDJSON layer: per-feature bboxes and (offset, length) of each line"""
+    return layer_path.with_suffix(".bbox.npy"), layer_path.with_suffix(".offsets.npy")
+
+
+def _stream_dump_features(features: Iterator[Dict[str, Any]], out_path: Path) -> int:
+    """Write features to out_path as NDJSON (one feature per line) with its bbox index; returns the count"""
+    dumps = orjson.dumps if ORJSON_AVAILABLE else (lambda obj: json.dumps(obj).encode())
+    # Write beside the target and swap in at the end, so the source may be the file being replaced
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    bboxes, offsets = [], []
+    position = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            for feature in features:
+                line = dumps(feature) + b"\n"
+                f.write(line)
+                bboxes.append(_feature_bbox(feature))
+                offsets.append((position, len(line)))
+                position += len(line)
+        os.replace(tmp_path, out_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    # Index written after the layer, so a complete index is never older than its layer file
+    bbox_path, offsets_path = _index_paths(out_path)
+    np.save(bbox_path, np.asarray(bboxes, dtype=np.float32).reshape(-1, 4))
+    np.save(offsets_path, np.asarray(offsets, dtype=np.int64).reshape(-1, 2))
+    return len(offsets)
+
+
 class NOAAENCLoader:
     """Load maritime features from NOAA ENC Direct-to-GIS services"""
     
@@ -43,6 +130,17 @@ class NOAAENCLoader:
         "hawaii": (-162.0, 18.0, -154.0, 23.0),          # Hawaii
         "us_full": (-180.0, 18.0, -66.0, 72.0),          # All US waters
     }
+
+    # Chart layers: (key, log label, settings prefix of its *_GEOJSON / *_NDJSON file names)
+    LAYER_SPECS = (
+        ("tss_corridors", "TSS corridors", "TSS_CORRIDORS"),
+        ("sea_buoys", "sea buoys", "SEA_BUOYS"),
+        ("pilotage_zones", "pilotage zones", "PILOTAGE_ZONES"),
+        ("restricted_areas", "restricted areas", "RESTRICTED_AREAS"),
+        ("depth_areas", "depth areas", "DEPTH_AREAS"),
+        ("wrecks_obstructions", "wrecks/obstructions", "WRECKS_OBSTRUCTIONS"),
+        ("pipelines_cables", "pipelines/cables", "PIPELINES_CABLES"),
+    )
     
     def __init__(self, settings_obj, cache_dir: Optional[Path] = None, cache_ttl_hours: int = 24):
         self.cache_dir = cache_dir or (Path(__file__).parent / "noaa_cache")
@@ -51,7 +149,10 @@ class NOAAENCLoader:
         self.cache_dir.mkdir(exist_ok=True)
         self.cache_ttl = cache_ttl_hours * 3600  # Convert to seconds
         self.settings = settings_obj  # Store the settings object
-        self.charts_dir = Path(self.settings.CHARTS_DIR) # Initialize charts_dir from settings
+        # Frozen field snapshot taken from this settings object, so charts_dir, the layer file names
+        # and the worker count all come from the same values (falls back to the object itself)
+        self._settings_view = getattr(settings_obj, "view", settings_obj)
+        self.charts_dir = Path(self._settings_view.CHARTS_DIR) # Initialize charts_dir from settings
         # self.LAYERS = self._get_map_server_info() # Dynamically get layer IDs
 
     # def _get_map_server_info(self) -> Dict[str, int]:
@@ -82,45 +183,95 @@ class NOAAENCLoader:
     #     # Mock data fetching to return empty GeoJSON for now
     #     return {"type": "FeatureCollection", "features": []}
 
-    def load_tss_corridors(self, region: str = "us_full") -> List[Dict[str, Any]]:
-        """Load TSS lanes and convert to corridor format"""
-        logger.info(f"Loading TSS corridors from {self.settings.TSS_CORRIDORS_GEOJSON}")
-        file_path = self.charts_dir / self.settings.TSS_CORRIDORS_GEOJSON
+    def _layer_path(self, settings_prefix: str) -> Path:
+        """Layer file to read: the NDJSON copy when it exists, else the GeoJSON file"""
+        ndjson_path = self.charts_dir / getattr(self._settings_view, f"{settings_prefix}_NDJSON")
+        if ndjson_path.exists():
+            return ndjson_path
+        return self.charts_dir / getattr(self._settings_view, f"{settings_prefix}_GEOJSON")
+
+    @classmethod
+    def _region_rows(cls, file_path: Path, region: Optional[str]) -> Optional[np.ndarray]:
+        """(offset, length) of the NDJSON lines whose bbox meets the region, or None without a fresh index"""
+        if region is None or region not in cls.REGIONS or file_path.suffix != ".ndjson":
+            return None
+        bbox_path, offsets_path = _index_paths(file_path)
+        layer_mtime = file_path.stat().st_mtime
+        if not all(p.exists() and p.stat().st_mtime >= layer_mtime for p in (bbox_path, offsets_path)):
+            return None
+
+        bboxes, offsets = np.load(bbox_path), np.load(offsets_path)
+        return offsets[_region_mask(bboxes, cls.REGIONS[region])]
+
+    @classmethod
+    def _iter_features(cls, file_path: Path, label: str,
+                       region: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the features of a layer file (NDJSON, a FeatureCollection or a bare feature list) meeting region"""
         if not file_path.exists():
-            return []
+            return
         try:
-            with open(file_path, "r") as f:
-                return json.load(f)
+            rows = cls._region_rows(file_path, region)
+            if rows is not None:
+                # Parse only the lines of features inside the region
+                loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+                with open(file_path, "rb") as f:
+                    for offset, length in rows.tolist():
+                        f.seek(offset)
+                        yield loads(f.read(length))
+                return
+            features = cls._scan_features(file_path)
+            if region in cls.REGIONS:
+                # No fresh index: the same float32 bbox test, one feature at a time
+                region_bbox = cls.REGIONS[region]
+                features = (feature for feature in features
+                            if _region_mask(np.asarray([_feature_bbox(feature)], dtype=np.float32), region_bbox)[0])
+            yield from features
         except Exception as e:
-            logger.error(f"Error loading TSS corridors from {file_path}: {e}")
-            return []
-    
-    def load_sea_buoys(self, region: str = "us_full") -> List[Dict[str, Any]]:
-        """Load AtoN and filter for sea buoys"""
-        logger.info(f"Loading sea buoys from {self.settings.SEA_BUOYS_GEOJSON}")
-        file_path = self.charts_dir / self.settings.SEA_BUOYS_GEOJSON
-        if not file_path.exists():
-            return []
-        try:
-            with open(file_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading sea buoys from {file_path}: {e}")
-            return []
-    
-    def load_pilotage_zones(self, region: str = "us_full") -> List[Dict[str, Any]]:
-        """Load pilotage areas (approximate from restricted areas)"""
-        logger.info(f"Loading pilotage zones from {self.settings.PILOTAGE_ZONES_GEOJSON}")
-        file_path = self.charts_dir / self.settings.PILOTAGE_ZONES_GEOJSON
+            logger.error(f"Error loading {label} from {file_path}: {e}")
+
+    @staticmethod
+    def _scan_features(file_path: Path) -> Iterator[Dict[str, Any]]:
+        """Yield every feature of a layer file, in file order"""
+        with open(file_path, "rb") as f:
+            if file_path.suffix == ".ndjson":
+                # One feature per line: no bracket state to track
+                loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+                yield from (loads(line) for line in f if line.strip())
+                return
+            # Parse from a read-only memory map: the page cache backs it, with no read() copy or text decode
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if IJSON_AVAILABLE:
+                    # One feature in memory at a time, however large the file.
+                    # The first significant byte tells a bare list from a FeatureCollection
+                    prefix = "item" if mm[:64].lstrip().startswith(b"[") else "features.item"
+                    yield from ijson.items(mm, prefix, use_float=True)
+                    return
+                if ORJSON_AVAILABLE:
+                    with memoryview(mm) as view:
+                        data = orjson.loads(view)
+                else:
+                    data = json.loads(mm[:])
+            yield from (data if isinstance(data, list) else data.get("features", []))
+
+    def _load_features(self, file_path: Path, label: str,
+                       region: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Features of a layer file, parsed once per file version and served from the layer cache"""
         if not file_path.exists():
             return []
-        try:
-            with open(file_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading pilotage zones from {file_path}: {e}")
-            return []
-    
+        if region not in self.REGIONS:
+            region = None  # Unknown regions read the whole layer; share its cache entry
+        return list(_load_layer(str(file_path), file_path.stat().st_mtime_ns, label, region))
+
+    def _load(self, label: str, settings_prefix: str, region: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Load the features of one LAYER_SPECS layer, optionally only those meeting a REGIONS bbox
+        (each load_<key> method is this, bound to its spec).
+
+        The list is new on every call, but the feature dicts in it are shared with the in-process
+        layer cache: treat them as read-only and copy a feature before editing it."""
+        file_path = self._layer_path(settings_prefix)
+        logger.info(f"Loading {label} from {file_path.name}")
+        return self._load_features(file_path, label, region)
+
     def _parse_tss_direction(self, props: Dict[str, Any]) -> str:
         """Parse TSS lane direction from properties"""
         # This is simplified - real ENC data has complex direction encoding
@@ -160,58 +311,6 @@ class NOAAENCLoader:
         
         return False
     
-    def load_restricted_areas(self, region: str = "us_full") -> List[Dict[str, Any]]:
-        """Load restricted/prohibited areas"""
-        logger.info(f"Loading restricted areas from {self.settings.RESTRICTED_AREAS_GEOJSON}")
-        file_path = self.charts_dir / self.settings.RESTRICTED_AREAS_GEOJSON
-        if not file_path.exists():
-            return []
-        try:
-            with open(file_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading restricted areas from {file_path}: {e}")
-            return []
-
-    def load_depth_areas(self, region: str = "us_full") -> List[Dict[str, Any]]:
-        """Load depth areas/contours with min/max depth attributes"""
-        logger.info(f"Loading depth areas from {self.settings.DEPTH_AREAS_GEOJSON}")
-        file_path = self.charts_dir / self.settings.DEPTH_AREAS_GEOJSON
-        if not file_path.exists():
-            return []
-        try:
-            with open(file_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading depth areas from {file_path}: {e}")
-            return []
-
-    def load_wrecks_obstructions(self, region: str = "us_full") -> List[Dict[str, Any]]:
-        """Load wrecks and obstructions as point hazards"""
-        logger.info(f"Loading wrecks and obstructions from {self.settings.WRECKS_OBSTRUCTIONS_GEOJSON}")
-        file_path = self.charts_dir / self.settings.WRECKS_OBSTRUCTIONS_GEOJSON
-        if not file_path.exists():
-            return []
-        try:
-            with open(file_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading wrecks/obstructions from {file_path}: {e}")
-            return []
-
-    def load_pipelines_cables(self, region: str = "us_full") -> List[Dict[str, Any]]:
-        """Load pipelines and cables as line features"""
-        logger.info(f"Loading pipelines and cables from {self.settings.PIPELINES_CABLES_GEOJSON}")
-        file_path = self.charts_dir / self.settings.PIPELINES_CABLES_GEOJSON
-        if not file_path.exists():
-            return []
-        try:
-            with open(file_path, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading pipelines/cables from {file_path}: {e}")
-            return []
-    
     def create_maritime_data_json(self, region: str = "us_full", output_file: Optional[Path] = None) -> Dict[str, Any]:
         """Create complete maritime_data.json from NOAA ENC"""
         if output_file is None or isinstance(output_file, str):
@@ -219,52 +318,21 @@ class NOAAENCLoader:
         
         logger.info(f"Creating maritime data for {region}...")
         
-        # Load all components (which will return empty lists due to mocking)
-        tss_corridors = self.load_tss_corridors(region)
-        sea_buoys = self.load_sea_buoys(region)
-        pilotage_zones = self.load_pilotage_zones(region)
-        restricted_areas = self.load_restricted_areas(region)
-        depth_areas = self.load_depth_areas(region)
-        wrecks_obstructions = self.load_wrecks_obstructions(region)
-        pipelines_cables = self.load_pipelines_cables(region)
-
-        # Save all components to individual files and create the main maritime_data.json
+        # Stream every layer from its source file into its NDJSON output, one feature at a time
         chart_data_root = self.charts_dir 
 
-        # Save TSS Corridors
-        tss_output_path = chart_data_root / self.settings.TSS_CORRIDORS_GEOJSON
-        json.dump(tss_corridors, tss_output_path.open("w"), indent=2)
-        logger.info(f"Saved TSS corridors to {tss_output_path}")
-
-        # Save Sea Buoys
-        sea_buoys_output_path = chart_data_root / self.settings.SEA_BUOYS_GEOJSON
-        json.dump(sea_buoys, sea_buoys_output_path.open("w"), indent=2)
-        logger.info(f"Saved sea buoys to {sea_buoys_output_path}")
-
-        # Save Pilotage Zones
-        pilotage_output_path = chart_data_root / self.settings.PILOTAGE_ZONES_GEOJSON
-        json.dump(pilotage_zones, pilotage_output_path.open("w"), indent=2)
-        logger.info(f"Saved pilotage zones to {pilotage_output_path}")
-
-        # Save Restricted Areas
-        restricted_areas_output_path = chart_data_root / self.settings.RESTRICTED_AREAS_GEOJSON
-        json.dump(restricted_areas, restricted_areas_output_path.open("w"), indent=2)
-        logger.info(f"Saved restricted areas to {restricted_areas_output_path}")
-
-        # Save Depth Areas
-        depth_areas_output_path = chart_data_root / self.settings.DEPTH_AREAS_GEOJSON
-        json.dump(depth_areas, depth_areas_output_path.open("w"), indent=2)
-        logger.info(f"Saved depth areas to {depth_areas_output_path}")
-
-        # Save Wrecks & Obstructions
-        wrecks_obstructions_output_path = chart_data_root / self.settings.WRECKS_OBSTRUCTIONS_GEOJSON
-        json.dump(wrecks_obstructions, wrecks_obstructions_output_path.open("w"), indent=2)
-        logger.info(f"Saved wrecks/obstructions to {wrecks_obstructions_output_path}")
-
-        # Save Pipelines & Cables
-        pipelines_cables_output_path = chart_data_root / self.settings.PIPELINES_CABLES_GEOJSON
-        json.dump(pipelines_cables, pipelines_cables_output_path.open("w"), indent=2)
-        logger.info(f"Saved pipelines/cables to {pipelines_cables_output_path}")
+        def write_layer(spec: Tuple[str, str, str]) -> Path:
+            _, label, settings_prefix = spec
+            output_path = chart_data_root / getattr(self._settings_view, f"{settings_prefix}_NDJSON")
+            # Full layer (no region pruning), streamed past the layer cache: the output replaces the layer file itself
+            features = self._iter_features(self._layer_path(settings_prefix), label)
+            count = _stream_dump_features(features, output_path)
+            logger.info(f"Saved {count} {label} to {output_path}")
+            return output_path
+
+        # Layers are independent files: read and write them concurrently, one layer per worker
+        with ThreadPoolExecutor(max_workers=self._settings_view.MAX_WORKERS) as executor:
+            output_paths = list(executor.map(write_layer, self.LAYER_SPECS))
 
         # Create the main maritime_data.json (which will now be a metadata file)
         maritime_data = {
@@ -272,20 +340,27 @@ class NOAAENCLoader:
             "generated": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
             "region": region,
             "bbox": self.REGIONS[region],
-            "tss_corridors_file": str(tss_output_path.name),
-            "sea_buoys_file": str(sea_buoys_output_path.name),
-            "pilotage_zones_file": str(pilotage_output_path.name),
-            "restricted_areas_file": str(restricted_areas_output_path.name),
-            "depth_areas_file": str(depth_areas_output_path.name),
-            "wrecks_obstructions_file": str(wrecks_obstructions_output_path.name),
-            "pipelines_cables_file": str(pipelines_cables_output_path.name)
+            **{f"{key}_file": path.name for (key, _, _), path in zip(self.LAYER_SPECS, output_paths)},
         }
 
-        output_file.write_text(json.dumps(maritime_data, indent=2))
+        _write_json(maritime_data, output_file)
         logger.info(f"Saved maritime data metadata to {output_file}")
         return maritime_data
 
 
+# One load_<key>(region=None) method per chart layer
+for _key, _label, _settings_prefix in NOAAENCLoader.LAYER_SPECS:
+    setattr(NOAAENCLoader, f"load_{_key}", partialmethod(NOAAENCLoader._load, _label, _settings_prefix))
+del _key, _label, _settings_prefix
+
+
+@lru_cache(maxsize=16)
+def _load_layer(path: str, mtime_ns: int, label: str, region: Optional[str]) -> Tuple[Dict[str, Any], ...]:
+    """Parsed features of one version of a layer file; a rewritten file has a new mtime and misses.
+    Every caller gets the same feature dicts, which must not be mutated."""
+    return tuple(NOAAENCLoader._iter_features(Path(path), label, region))
+
+
 def main():
     """CLI for loading NOAA ENC data"""
     import argparse
@@ -3,6 +3,7 @@ Configuration settings for the Maritime Route Optimization Tool using Pydantic.
 Loads from .env file and provides validated, type-safe settings.
 """
 import os
+from dataclasses import make_dataclass
 from typing import Dict, Any, Callable
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
@@ -34,6 +35,7 @@ class Settings(BaseSettings):
     AIS_BOUNDS: Dict[str, float] = {
         "north": 38.5, "south": 36.5, "east": -121.5, "west": -123.5
     }
+    AIS_PREFILTER_MESSAGES: bool = True  # skip non-position frames before JSON parsing
 
     # Default test location
     DEFAULT_LAT: float = 37.5
@@ -44,9 +46,15 @@ class Settings(BaseSettings):
     TEST_SIZE: float = 0.2
     ML_MODEL_PATH: str = "models/"
 
+    # Plot settings (figures are rendered off-screen with Agg unless interactive)
+    PLOT_INTERACTIVE: bool = False
+    PLOT_DPI: int = 150
+    PLOT_SCATTER_MAX_POINTS: int = 1000  # larger vessel sets are drawn as a hexbin density
+
     # Weather API settings
     WEATHER_FORECAST_HOURS: int = 72
     WEATHER_UPDATE_INTERVAL: int = 3600  # 1 hour
+    WEATHER_CACHE_TTL: int = 900  # reuse forecast responses for 15 minutes
 
     # Navigation settings
     EARTH_RADIUS_NM: float = 3440.065
@@ -109,9 +117,26 @@ class Settings(BaseSettings):
     DEPTH_AREAS_GEOJSON: str = "noaa_depth_areas.json"
     WRECKS_OBSTRUCTIONS_GEOJSON: str = "noaa_wrecks_obstructions.json"
     PIPELINES_CABLES_GEOJSON: str = "noaa_pipelines_cables.json"
+    # Newline-delimited (one feature per line) layer files written by enc_loader.py; preferred when present
+    TSS_CORRIDORS_NDJSON: str = "noaa_tss_corridors.ndjson"
+    SEA_BUOYS_NDJSON: str = "noaa_sea_buoys.ndjson"
+    PILOTAGE_ZONES_NDJSON: str = "noaa_pilotage_zones.ndjson"
+    RESTRICTED_AREAS_NDJSON: str = "noaa_restricted_areas.ndjson"
+    DEPTH_AREAS_NDJSON: str = "noaa_depth_areas.ndjson"
+    WRECKS_OBSTRUCTIONS_NDJSON: str = "noaa_wrecks_obstructions.ndjson"
+    PIPELINES_CABLES_NDJSON: str = "noaa_pipelines_cables.ndjson"
     
     # Safety depth and contour settings
     SAFETY_DEPTH_MARGIN_M: float = 2.0                  # margin for safety contour beyond shallow contour
 
+    @property
+    def view(self) -> "_SettingsView":
+        """Frozen snapshot of the current field values for hot-path reads; take it once per consumer"""
+        return _SettingsView(**{name: getattr(self, name) for name in type(self).model_fields})
+
+
+# Slotted, immutable mirror of the Settings fields
+_SettingsView = make_dataclass("_SettingsView", list(Settings.model_fields), frozen=True, slots=True)
+
 # Instantiate the settings object to be used throughout the application
 settings = Settings()
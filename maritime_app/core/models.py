@@ -6,6 +6,14 @@ from enum import Enum
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+import numpy as np
+
+# Unit conversion factors
+KNOTS_TO_KMH = 1.852
+KMH_TO_KNOTS = 1 / KNOTS_TO_KMH
+M_TO_FT = 3.28084
+FT_TO_M = 1 / M_TO_FT
+
 
 class RouteObjective(Enum):
     """Optimization objectives for route planning"""
@@ -15,7 +23,7 @@ class RouteObjective(Enum):
     BALANCED = "balanced"
 
 
-@dataclass
+@dataclass(slots=True)
 class RouteConstraints:
     """Constraints for route optimization"""
     max_speed_knots: float = 20.0
@@ -30,7 +38,7 @@ class RouteConstraints:
     apply_squat: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduleRequirement:
     """Time-based schedule requirements"""
     departure_time: Optional[datetime] = None
@@ -40,27 +48,27 @@ class ScheduleRequirement:
 
 
 class MaritimeUnits:
-    """Maritime unit conversion utilities"""
+    """Maritime unit conversion utilities (scalars or NumPy arrays)"""
 
     @staticmethod
     def knots_to_kmh(speed_knots: float) -> float:
         """Convert knots to kilometers per hour"""
-        return speed_knots * 1.852
+        return speed_knots * KNOTS_TO_KMH
 
     @staticmethod
     def kmh_to_knots(speed_kmh: float) -> float:
         """Convert kilometers per hour to knots"""
-        return speed_kmh / 1.852
+        return speed_kmh / KNOTS_TO_KMH
 
     @staticmethod
     def meters_to_feet(meters: float) -> float:
         """Convert meters to feet"""
-        return meters * 3.28084
+        return meters * M_TO_FT
 
     @staticmethod
     def feet_to_meters(feet: float) -> float:
         """Convert feet to meters"""
-        return feet / 3.28084
+        return feet / M_TO_FT
 
     @staticmethod
     def celsius_to_fahrenheit(celsius: float) -> float:
@@ -73,7 +81,7 @@ class MaritimeUnits:
         return (fahrenheit - 32) * 5/9
 
 
-@dataclass
+@dataclass(slots=True)
 class VesselData:
     """Vessel information data structure"""
     mmsi: int
@@ -90,7 +98,7 @@ class VesselData:
     timestamp: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WeatherData:
     """Weather information data structure"""
     latitude: float
@@ -110,7 +118,7 @@ class WeatherData:
             self.timestamp = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class Waypoint:
     """Waypoint data structure"""
     latitude: float
@@ -123,7 +131,35 @@ class Waypoint:
     distance_to_next_nm: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
+class RouteArrays:
+    """Structure-of-arrays view of a waypoint list for vectorized route math"""
+    lat: np.ndarray  # float64 degrees
+    lon: np.ndarray  # float64 degrees
+    speed: np.ndarray  # float32 knots, NaN where unset
+    course: np.ndarray  # float32 degrees, NaN where unset
+    dist: np.ndarray  # float64 nm to the next waypoint, NaN where unset
+    eta: np.ndarray  # datetime64[s], NaT where unset
+
+    @classmethod
+    def from_waypoints(cls, waypoints: List[Waypoint]) -> "RouteArrays":
+        """Gather the waypoint fields into columns in a single pass"""
+        nan = float("nan")
+        rows = np.array([(wp.latitude, wp.longitude,
+                          nan if wp.speed_knots is None else wp.speed_knots,
+                          nan if wp.course_deg is None else wp.course_deg,
+                          nan if wp.distance_to_next_nm is None else wp.distance_to_next_nm)
+                         for wp in waypoints], dtype=np.float64).reshape(-1, 5)
+        eta = np.array([wp.estimated_time for wp in waypoints], dtype="datetime64[s]")
+        return cls(lat=rows[:, 0], lon=rows[:, 1],
+                   speed=rows[:, 2].astype(np.float32), course=rows[:, 3].astype(np.float32),
+                   dist=rows[:, 4], eta=eta)
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+
+@dataclass(slots=True)
 class Route:
     """Complete route data structure"""
     waypoints: List[Waypoint]
@@ -137,8 +173,12 @@ class Route:
     vessel_data: Optional[VesselData] = None
     constraints: Optional[RouteConstraints] = None
 
+    def to_arrays(self) -> RouteArrays:
+        """Waypoints as column arrays for vectorized distance, bearing and ETA math"""
+        return RouteArrays.from_waypoints(self.waypoints)
+
 
-@dataclass
+@dataclass(slots=True)
 class RouteOptimizationResult:
     """Result of route optimization"""
     route: Route
@@ -155,7 +195,7 @@ class RouteOptimizationResult:
             self.created_at = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class NavigationParameters:
     """Navigation calculation parameters"""
     magnetic_variation_deg: float = 0.0
@@ -166,7 +206,7 @@ class NavigationParameters:
     tidal_rate_knots: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Vessel performance tracking metrics"""
     mmsi: int
@@ -2,74 +2,145 @@
 AIS Data Collection Module
 Handles real-time AIS vessel data collection from WebSocket streams
 """
-import websocket
+import asyncio
 import json
-import threading
+import logging
 import queue
 import time
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+import websockets
+
 from ...config.settings import settings
 from ...core.models import VesselData
 
+logger = logging.getLogger(__name__)
+
+# Optional fast JSON codec for the stream hot path (graceful fallback if unavailable)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# Optional faster event loop for the receive path
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+AIS_STREAM_URL = "wss://stream.aisstream.io/v0/stream"
+POSITIONS_MARKER = '"positions"'
+POSITIONS_MARKER_BYTES = POSITIONS_MARKER.encode()
+WS_BUFFER_BYTES = 2 ** 20
+
+
+@lru_cache(maxsize=256)
+def _datetime_from_epoch(seconds: float) -> datetime:
+    """Epoch seconds to datetime, shared by all frames stamped with the same value"""
+    return datetime.fromtimestamp(seconds)
+
 
 class AISDataCollector:
     """Handles AIS data collection from WebSocket stream"""
 
     def __init__(self, api_key: str = settings.AISSTREAM_API_KEY,
-                 bounds: Dict[str, float] = settings.AIS_BOUNDS):
+                 bounds: Dict[str, float] = settings.AIS_BOUNDS,
+                 max_vessels: int = 10000):
         self.api_key = api_key
         self.bounds = bounds
+        self.max_vessels = max_vessels
+        self._bbox = (float(bounds['south']), float(bounds['north']),
+                      float(bounds['west']), float(bounds['east']))
         self.vessels = []
-        self.ws = None
+
+        # Columnar (structure-of-arrays) store of collected positions
+        self._count = 0
+        self._mmsi = np.zeros(max_vessels, dtype=np.int64)
+        # Positions stay float64: float32 keeps only ~7 digits, about 1 m of AIS precision
+        self._lat = np.zeros(max_vessels, dtype=np.float64)
+        self._lon = np.zeros(max_vessels, dtype=np.float64)
+        self._sog = np.full(max_vessels, np.nan, dtype=np.float32)
+        self._cog = np.full(max_vessels, np.nan, dtype=np.float32)
+        self._name: List[Optional[str]] = []
         self.running = False
-        self.data_queue = queue.Queue()
-        self.collection_thread = None
+        self._loop = None
+        self._done = None
+        self.data_queue = queue.Queue(maxsize=max_vessels * 4)
+        self.dropped_messages = 0
+        self.prefilter_messages = settings.AIS_PREFILTER_MESSAGES
+
+        # Subscription payload is fixed per collector: serialize it once
+        self._subscription_message = _json_dumps({
+            "msg_type": "subscribe",
+            "api_key": api_key,
+            "bounding_box": bounds
+        })
 
-    def _on_message(self, ws, message):
+    def _handle_message(self, message):
         """Handle incoming WebSocket messages"""
+        # Substring scan is far cheaper than a full parse of frames we would discard
+        if self.prefilter_messages:
+            marker = POSITIONS_MARKER_BYTES if isinstance(message, bytes) else POSITIONS_MARKER
+            if marker not in message:
+                return
         try:
-            data = json.loads(message)
+            data = _json_loads(message)
             if data.get('msg_type') == 'positions':
                 vessels = data.get('positions', [])
                 for vessel_data in vessels:
                     processed_vessel = self._process_vessel_data(vessel_data)
                     if processed_vessel:
-                        self.data_queue.put(processed_vessel)
+                        try:
+                            self.data_queue.put_nowait(processed_vessel)
+                        except queue.Full:
+                            # Consumer is behind: drop rather than buffer without bound
+                            self.dropped_messages += 1
+                if self._count + self.data_queue.qsize() >= self.max_vessels:
+                    self.stop_collection()
         except json.JSONDecodeError as e:
-            print(f"Error parsing AIS message: {e}")
+            logger.warning("Error parsing AIS message: %s", e)
         except Exception as e:
-            print(f"Error processing AIS message: {e}")
-
-    def _on_error(self, ws, error):
-        """Handle WebSocket errors"""
-        print(f"AIS WebSocket error: {error}")
+            logger.warning("Error processing AIS message: %s", e)
 
-    def _on_close(self, ws, close_status_code, close_msg):
-        """Handle WebSocket connection close"""
-        print(f"AIS WebSocket connection closed: {close_status_code} - {close_msg}")
-        self.running = False
-
-    def _on_open(self, ws):
-        """Handle WebSocket connection open"""
-        print("AIS WebSocket connection opened")
-        # Send subscription message
-        subscription = {
-            "msg_type": "subscribe",
-            "api_key": self.api_key,
-            "bounding_box": self.bounds
-        }
-        ws.send(json.dumps(subscription))
-        print("AIS subscription sent")
+    async def _subscribe(self, ws):
+        """Send the subscription message on a freshly opened connection"""
+        logger.info("AIS WebSocket connection opened")
+        await ws.send(self._subscription_message)
+        logger.debug("AIS subscription sent")
 
     def _process_vessel_data(self, vessel_data: Dict[str, Any]) -> Optional[VesselData]:
         """Process raw AIS data into VesselData object"""
         try:
             # Filter out vessels without position data
-            if not all(k in vessel_data for k in ['lat', 'lon']):
+            lat, lon = vessel_data.get('lat'), vessel_data.get('lon')
+            if lat is None or lon is None:
+                return None
+
+            # Cheap bbox rejection before building the VesselData object
+            south, north, west, east = self._bbox
+            if not (south <= lat <= north and west <= lon <= east):
                 return None
 
+            # Frames without a timestamp share one datetime per wall-clock second
+            epoch = vessel_data.get('timestamp')
+            if epoch is None:
+                epoch = int(time.time())
+
             # Create VesselData object
             vessel = VesselData(
                 mmsi=vessel_data.get('mmsi'),
@@ -78,79 +149,123 @@ class AISDataCollector:
                 length=vessel_data.get('length'),
                 width=vessel_data.get('width'),
                 draft=vessel_data.get('draught'),
-                latitude=vessel_data.get('lat'),
-                longitude=vessel_data.get('lon'),
+                latitude=lat,
+                longitude=lon,
                 speed=vessel_data.get('speed'),
                 course=vessel_data.get('course'),
                 heading=vessel_data.get('heading'),
-                timestamp=datetime.fromtimestamp(vessel_data.get('timestamp', time.time()))
+                timestamp=_datetime_from_epoch(epoch)
             )
 
             return vessel
         except Exception as e:
-            print(f"Error processing vessel data: {e}")
+            logger.warning("Error processing vessel data: %s", e)
             return None
 
-    def start_collection(self, duration_seconds: int = 30) -> List[VesselData]:
-        """Start AIS data collection for specified duration"""
+    async def _receive(self):
+        """Receive frames until stopped or the connection closes"""
+        async with websockets.connect(AIS_STREAM_URL, max_size=WS_BUFFER_BYTES,
+                                      write_limit=WS_BUFFER_BYTES) as ws:
+            await self._subscribe(ws)
+            async for message in ws:
+                self._handle_message(message)
+                if not self.running:
+                    break
+        logger.info("AIS WebSocket connection closed")
+
+    async def start_collection_async(self, duration_seconds: int = 30) -> List[VesselData]:
+        """Collect AIS data for the specified duration on the running event loop"""
         print(f"Starting AIS data collection for {duration_seconds} seconds...")
 
-        # WebSocket URL for aisstream.io
-        ws_url = f"wss://stream.aisstream.io/v0/stream"
+        self.running = True
+        self._loop = asyncio.get_running_loop()
+        self._done = asyncio.Event()
+
+        # Return on timeout, on stop (e.g. max_vessels reached) or when the server closes
+        receiver = asyncio.ensure_future(self._receive())
+        stopper = asyncio.ensure_future(self._done.wait())
+        try:
+            await asyncio.wait({receiver, stopper}, timeout=duration_seconds,
+                               return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.running = False
+            receiver.cancel()
+            stopper.cancel()
+            error = (await asyncio.gather(receiver, stopper, return_exceptions=True))[0]
+            self._loop = self._done = None
+        if isinstance(error, Exception):
+            logger.error("AIS WebSocket error: %s", error)
 
-        # Create WebSocket connection
-        websocket.enableTrace(False)  # Disable debug output
-        self.ws = websocket.WebSocketApp(
-            ws_url,
-            on_message=self._on_message,
-            on_error=self._on_error,
-            on_close=self._on_close,
-            on_open=self._on_open
-        )
+        collected_vessels = self._drain_queue()
+        if self.dropped_messages:
+            logger.warning("Dropped %d AIS positions (queue full)", self.dropped_messages)
 
-        self.running = True
-        collected_vessels = []
-
-        def run_ws():
-            """Run WebSocket in separate thread"""
-            self.ws.run_forever()
-
-        # Start WebSocket in background thread
-        ws_thread = threading.Thread(target=run_ws, daemon=True)
-        ws_thread.start()
-
-        # Collect data for specified duration
-        start_time = time.time()
-        while time.time() - start_time < duration_seconds and self.running:
-            try:
-                # Non-blocking queue get with timeout
-                vessel = self.data_queue.get(timeout=1.0)
-                collected_vessels.append(vessel)
-                print(f"Collected vessel: {vessel.name or 'Unknown'} (MMSI: {vessel.mmsi})")
-            except queue.Empty:
-                continue
-
-        # Stop collection
-        self.stop_collection()
+        self._store_vessels(collected_vessels)
         print(f"AIS collection complete. Collected {len(collected_vessels)} vessels.")
 
         return collected_vessels
 
+    def start_collection(self, duration_seconds: int = 30) -> List[VesselData]:
+        """Start AIS data collection for specified duration"""
+        if UVLOOP_AVAILABLE:
+            return uvloop.run(self.start_collection_async(duration_seconds))
+        return asyncio.run(self.start_collection_async(duration_seconds))
+
     def stop_collection(self):
         """Stop AIS data collection"""
         self.running = False
-        if self.ws:
-            self.ws.close()
+        if self._loop is not None and self._done is not None:
+            self._loop.call_soon_threadsafe(self._done.set)
+
+    def _drain_queue(self) -> List[VesselData]:
+        """Take everything queued in one batch under the queue lock"""
+        with self.data_queue.mutex:
+            items = list(self.data_queue.queue)
+            self.data_queue.queue.clear()
+            self.data_queue.not_full.notify_all()
+        return items
+
+    def _store_vessels(self, vessels: List[VesselData]):
+        """Append collected vessels to the columnar store (capped at max_vessels)"""
+        start = self._count
+        vessels = vessels[:self.max_vessels - start]
+        if not vessels:
+            return
+        end = start + len(vessels)
+
+        def column(attr):
+            return [np.nan if getattr(v, attr) is None else getattr(v, attr) for v in vessels]
+
+        self._mmsi[start:end] = [v.mmsi or 0 for v in vessels]
+        self._lat[start:end] = column('latitude')
+        self._lon[start:end] = column('longitude')
+        self._sog[start:end] = column('speed')
+        self._cog[start:end] = column('course')
+        self._name.extend(v.name for v in vessels)
+        self.vessels.extend(vessels)
+        self._count = end
 
     def get_vessel_count(self) -> int:
         """Get count of collected vessels"""
-        return len(self.vessels)
+        return self._count
 
     def get_vessels_in_bounds(self, bounds: Dict[str, float]) -> List[VesselData]:
         """Get vessels within specified bounds"""
-        filtered_vessels = []
-        for vessel in self.vessels:
-            if (bounds['south'] <= vessel.latitude <= bounds['north'] and
-                bounds['west'] <= vessel.longitude <= bounds['east']):
-                filtered_vessels.append(vessel)
-        return filtered_vessels
+        lat, lon = self._lat[:self._count], self._lon[:self._count]
+        mask = ((lat >= bounds['south']) & (lat <= bounds['north']) &
+                (lon >= bounds['west']) & (lon <= bounds['east']))
+        return [self.vessels[i] for i in np.flatnonzero(mask)]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Collected vessel positions as a DataFrame"""
+        n = self._count
+        # The frame gets its own copy of the columns, never the collector's writable buffers;
+        # names repeat across position reports and are stored once each as categories
+        return pd.DataFrame({
+            'mmsi': self._mmsi[:n],
+            'name': pd.Categorical(self._name[:n]),
+            'latitude': self._lat[:n],
+            'longitude': self._lon[:n],
+            'speed': self._sog[:n],
+            'course': self._cog[:n],
+        }, copy=True)
@@ -12,7 +12,7 @@ from .core.models import RouteObjective, RouteConstraints, VesselData, WeatherDa
 from .data.collectors.ais_collector import AISDataCollector
 from .data.processors.ml_processor import MaritimeMLDataProcessor
 from .routing.route_optimizer import EnhancedSailingCalculator
-from .utils.database import DatabaseManager
+from .utils.database import get_database_manager
 from .utils.visualization import MaritimeVisualizer
 
 
@@ -24,7 +24,7 @@ class MaritimeRouteOptimizer:
         print("=" * 60)
 
         # Initialize components
-        self.db = DatabaseManager()
+        self.db = get_database_manager()
         self.ais_collector = AISDataCollector()
         self.ml_processor = MaritimeMLDataProcessor()
         self.route_optimizer = EnhancedSailingCalculator(settings)
@@ -163,8 +163,11 @@ class MaritimeRouteOptimizer:
             # Create visualization
             self.visualizer.plot_route_analysis(route, weather_data)
 
-            # Calculate ETAs
-            etas = self.route_optimizer.calculate_eta(datetime.now(), route.waypoints, 12.0)
+            # Calculate ETAs (legs were already measured by optimize_route)
+            track = route.to_arrays()
+            etas = self.route_optimizer.calculate_eta(
+                datetime.now(), track, 12.0, track.dist[:-1]
+            )
 
             print("\n📊 ENHANCED ROUTE ANALYSIS:")
             print(f"   Total Waypoints: {len(route.waypoints)}")
@@ -179,18 +182,19 @@ class MaritimeRouteOptimizer:
                 sample_vessel = vessels[0] if vessels else VesselData(
                     mmsi=123456789, name="Sample Vessel", speed=12.0, draft=8.0
                 )
-                sample_weather = weather_data[:1] if weather_data else [
+                sample_weather = weather_data or [
                     WeatherData(settings.DEFAULT_LAT, settings.DEFAULT_LON)
                 ]
 
-                predictions = self.ml_processor.predict_optimization(
+                # One batched prediction over every forecast record
+                predictions = self.ml_processor.predict_optimization_batch(
                     sample_vessel, sample_weather
                 )
 
                 print("\n🤖 ML PREDICTIONS:")
-                print(f"   Average Optimal Speed: {predictions['optimal_speed_knots']:.1f} kts")
-                print(f"   Average Safety Score: {predictions['safety_score']:.2f}")
-                print(f"   Average Fuel Efficiency: {predictions['fuel_efficiency_score']:.2f}")
+                print(f"   Average Optimal Speed: {predictions['optimal_speed_knots'].mean():.1f} kts")
+                print(f"   Average Safety Score: {predictions['safety_score'].mean():.2f}")
+                print(f"   Average Fuel Efficiency: {predictions['fuel_efficiency_score'].mean():.2f}")
 
             print("\n✅ Enhanced maritime route optimization complete!")
             print("🤖 ML models integrated successfully!")
@@ -9,6 +9,7 @@ Author: Maritime Route Optimization Team
 """
 
 import math
+import numpy as np
 from typing import Tuple, List, Optional, Dict, Any
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -75,7 +76,7 @@ class MaritimeNavigation:
     
     def normalize_bearing(self, bearing: float) -> float:
         """Normalize bearing to 0-360 degrees"""
-        return (bearing % 360 + 360) % 360
+        return (bearing % 360 + 360) % 360  # second modulo: -1e-14 % 360 rounds to 360.0
     
     def great_circle_distance(self, pos1: Position, pos2: Position) -> float:
         """
@@ -117,14 +118,34 @@ class MaritimeNavigation:
         
         return self.normalize_bearing(course_deg)
     
+    def great_circle_course_and_distance(self, pos1: Position, pos2: Position) -> Tuple[float, float]:
+        """
+        Calculate great circle course and distance together, sharing the trig terms.
+        """
+        lat1_rad = self.degrees_to_radians(pos1.lat)
+        lat2_rad = self.degrees_to_radians(pos2.lat)
+        dlon = self.degrees_to_radians(pos2.lon) - self.degrees_to_radians(pos1.lon)
+        dlat = lat2_rad - lat1_rad
+        
+        sin_lat1, cos_lat1 = math.sin(lat1_rad), math.cos(lat1_rad)
+        sin_lat2, cos_lat2 = math.sin(lat2_rad), math.cos(lat2_rad)
+        
+        y = math.sin(dlon) * cos_lat2
+        x = cos_lat1 * sin_lat2 - sin_lat1 * cos_lat2 * math.cos(dlon)
+        course = self.normalize_bearing(self.radians_to_degrees(math.atan2(y, x)))
+        
+        a = math.sin(dlat / 2) ** 2 + cos_lat1 * cos_lat2 * math.sin(dlon / 2) ** 2
+        distance = self.earth_radius_nm * 2 * math.asin(math.sqrt(a))
+        
+        return course, distance
+    
     def calculate_course(self, pos1: Position, pos2: Position, 
                         use_great_circle: bool = True) -> CourseResult:
         """
         Calculate course and distance between two positions.
         """
         if use_great_circle:
-            course = self.great_circle_course(pos1, pos2)
-            distance = self.great_circle_distance(pos1, pos2)
+            course, distance = self.great_circle_course_and_distance(pos1, pos2)
             calc_type = "great_circle"
         else:
             # Simple rhumb line calculation
@@ -154,19 +175,13 @@ class MaritimeNavigation:
         Calculate cross track error from current position to a route.
         """
         # Calculate course from route start to end
-        route_course = self.great_circle_course(route_start, route_end)
-        route_distance = self.great_circle_distance(route_start, route_end)
+        route_course, route_distance = self.great_circle_course_and_distance(route_start, route_end)
         
         # Calculate course from route start to current position
-        to_current_course = self.great_circle_course(route_start, current_pos)
-        to_current_distance = self.great_circle_distance(route_start, current_pos)
+        to_current_course, to_current_distance = self.great_circle_course_and_distance(route_start, current_pos)
         
-        # Calculate angle between route and line to current position
-        angle_diff = to_current_course - route_course
-        if angle_diff > 180:
-            angle_diff -= 360
-        elif angle_diff < -180:
-            angle_diff += 360
+        # Calculate angle between route and line to current position (wrapped to -180..180)
+        angle_diff = (to_current_course - route_course + 180) % 360 - 180
         
         # Calculate cross track error
         error_nm = to_current_distance * math.sin(self.degrees_to_radians(angle_diff))
@@ -204,12 +219,10 @@ class MaritimeNavigation:
         Calculate course made good and related navigation data.
         """
         # Course made good from start to current position
-        cmg = self.great_circle_course(start_pos, current_pos)
-        distance_made_good = self.great_circle_distance(start_pos, current_pos)
+        cmg, distance_made_good = self.great_circle_course_and_distance(start_pos, current_pos)
         
         # Course to target from current position
-        course_to_target = self.great_circle_course(current_pos, target_pos)
-        distance_to_target = self.great_circle_distance(current_pos, target_pos)
+        course_to_target, distance_to_target = self.great_circle_course_and_distance(current_pos, target_pos)
         
         # Total distance from start to target
         total_distance = self.great_circle_distance(start_pos, target_pos)
@@ -227,6 +240,22 @@ class MaritimeNavigation:
             "timestamp": datetime.now()
         }
     
+    def generate_waypoint_array(self, start_pos: Position, end_pos: Position,
+                                num_waypoints: int = 10) -> np.ndarray:
+        """
+        Interpolated waypoint positions as an (N, 2) array of lat/lon.
+        """
+        fractions = np.linspace(0.0, 1.0, max(num_waypoints, 2))
+        
+        lats = start_pos.lat + (end_pos.lat - start_pos.lat) * fractions
+        
+        # Shortest way round the antimeridian, without branching
+        dlon = end_pos.lon - start_pos.lon
+        dlon = dlon - 360 * (dlon > 180) + 360 * (dlon < -180)
+        lons = ((start_pos.lon + dlon * fractions + 180) % 360) - 180
+        
+        return np.column_stack((lats, lons))
+    
     def generate_waypoints(self, start_pos: Position, end_pos: Position, 
                           num_waypoints: int = 10, 
                           use_great_circle: bool = True) -> List[Position]:
@@ -236,27 +265,8 @@ class MaritimeNavigation:
         if num_waypoints < 2:
             return [start_pos, end_pos]
         
-        waypoints = [start_pos]
-        
-        for i in range(1, num_waypoints - 1):
-            fraction = i / (num_waypoints - 1)
-            
-            # Interpolate latitude
-            lat = start_pos.lat + fraction * (end_pos.lat - start_pos.lat)
-            
-            # Interpolate longitude
-            dlon = end_pos.lon - start_pos.lon
-            if dlon > 180:
-                dlon -= 360
-            elif dlon < -180:
-                dlon += 360
-            
-            lon = start_pos.lon + fraction * dlon
-            
-            waypoints.append(Position(lat, lon))
-        
-        waypoints.append(end_pos)
-        return waypoints
+        interior = self.generate_waypoint_array(start_pos, end_pos, num_waypoints)[1:-1]
+        return [start_pos] + [Position(lat, lon) for lat, lon in interior.tolist()] + [end_pos]
     
     def calculate_eta(self, current_pos: Position, target_pos: Position, 
                      speed_knots: float) -> datetime:
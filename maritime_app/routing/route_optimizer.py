@@ -3,31 +3,209 @@ Route Optimization Module
 Handles sailing calculations and route optimization algorithms
 """
 import math
+import mmap
 import numpy as np
-from typing import List, Dict, Any, Tuple, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple, Optional, Union
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
 
 from ..config.settings import settings
-from ..core.models import Waypoint, Route, RouteConstraints, RouteObjective, WeatherData, VesselData
-from ..utils.database import DatabaseManager
+from ..core.models import Waypoint, Route, RouteArrays, RouteConstraints, RouteObjective, WeatherData, VesselData
+from ..utils.database import get_database_manager
 
 # Optional geospatial support (graceful fallback if unavailable)
 try:
     from shapely.geometry import Point, shape, LineString, Polygon, MultiPolygon
     from shapely.ops import unary_union, nearest_points
     from shapely.strtree import STRtree
+    import shapely
     SHAPELY_AVAILABLE = True
 except ImportError:
     SHAPELY_AVAILABLE = False
 
+# Optional fast JSON decoder for the chart files (graceful fallback if unavailable)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional JIT compilation of the great-circle kernels (graceful fallback if unavailable)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Squat coefficient by AIS vessel type code (0-99), as a flat lookup table
+_SQUAT_COEFF = np.full(100, 0.8)
+_SQUAT_COEFF[0] = 0.7            # unknown type
+_SQUAT_COEFF[[62, 64]] = 1.0     # cargo, tanker
+_SQUAT_COEFF[[40, 60]] = 0.6     # HSC, passenger
+
+
+def gc_distance_vec(lat1, lon1, lat2, lon2, radius):
+    """Haversine distance over float64 position arrays, in the units of radius"""
+    lat1_rad, lat2_rad = np.radians(lat1), np.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = np.radians(lon2) - np.radians(lon1)
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2) ** 2
+    return radius * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def bearing_vec(lat1, lon1, lat2, lon2):
+    """Initial bearing in degrees (0-360) over float64 position arrays"""
+    lat1_rad, lat2_rad = np.radians(lat1), np.radians(lat2)
+    dlon = np.radians(lon2) - np.radians(lon1)
+
+    x = np.sin(dlon) * np.cos(lat2_rad)
+    y = np.cos(lat1_rad) * np.sin(lat2_rad) - np.sin(lat1_rad) * np.cos(lat2_rad) * np.cos(dlon)
+    return (np.degrees(np.arctan2(x, y)) + 360) % 360
+
+
+def course_and_distance_vec(lat1, lon1, lat2, lon2, radius):
+    """Initial bearing and haversine distance sharing one set of trig terms"""
+    lat1_rad, lat2_rad = np.radians(lat1), np.radians(lat2)
+    dlon = np.radians(lon2) - np.radians(lon1)
+    dlat = lat2_rad - lat1_rad
+
+    sin_lat1, cos_lat1 = np.sin(lat1_rad), np.cos(lat1_rad)
+    sin_lat2, cos_lat2 = np.sin(lat2_rad), np.cos(lat2_rad)
+
+    x = np.sin(dlon) * cos_lat2
+    y = cos_lat1 * sin_lat2 - sin_lat1 * cos_lat2 * np.cos(dlon)
+    bearing = (np.degrees(np.arctan2(x, y)) + 360) % 360
+
+    a = np.sin(dlat / 2) ** 2 + cos_lat1 * cos_lat2 * np.sin(dlon / 2) ** 2
+    distance = radius * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return bearing, distance
+
+
+def gc_distance(lat1, lon1, lat2, lon2, radius):
+    """Haversine distance between two positions (scalar kernel), in the units of radius"""
+    lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = math.radians(lon2) - math.radians(lon1)
+
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+    return radius * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def bearing(lat1, lon1, lat2, lon2):
+    """Initial bearing in degrees (0-360) between two positions (scalar kernel)"""
+    lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
+    dlon = math.radians(lon2) - math.radians(lon1)
+
+    x = math.sin(dlon) * math.cos(lat2_rad)
+    y = math.cos(lat1_rad) * math.sin(lat2_rad) - math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(dlon)
+    return (math.degrees(math.atan2(x, y)) + 360) % 360
+
+
+def course_and_distance(lat1, lon1, lat2, lon2, radius):
+    """Initial bearing and haversine distance between two positions (scalar kernel)"""
+    lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
+    dlon = math.radians(lon2) - math.radians(lon1)
+    dlat = lat2_rad - lat1_rad
+
+    sin_lat1, cos_lat1 = math.sin(lat1_rad), math.cos(lat1_rad)
+    sin_lat2, cos_lat2 = math.sin(lat2_rad), math.cos(lat2_rad)
+
+    x = math.sin(dlon) * cos_lat2
+    y = cos_lat1 * sin_lat2 - sin_lat1 * cos_lat2 * math.cos(dlon)
+    course = (math.degrees(math.atan2(x, y)) + 360) % 360
+
+    a = math.sin(dlat / 2) ** 2 + cos_lat1 * cos_lat2 * math.sin(dlon / 2) ** 2
+    return course, radius * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+if NUMBA_AVAILABLE:
+    gc_distance_vec = njit(cache=True, fastmath=True)(gc_distance_vec)
+    bearing_vec = njit(cache=True, fastmath=True)(bearing_vec)
+    course_and_distance_vec = njit(cache=True, fastmath=True)(course_and_distance_vec)
+    gc_distance = njit(cache=True, fastmath=True)(gc_distance)
+    bearing = njit(cache=True, fastmath=True)(bearing)
+    course_and_distance = njit(cache=True, fastmath=True)(course_and_distance)
+
+
+def _load_json_file(file_path: Path) -> Any:
+    """Parse a JSON file; with orjson, straight from a read-only memory map of its bytes"""
+    if ORJSON_AVAILABLE and file_path.stat().st_size:
+        # The page cache backs the mapping: no read() buffer or text decode before parsing
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+
+def _position_arrays(lat1, lon1, lat2, lon2) -> Tuple[np.ndarray, ...]:
+    """Broadcast coordinates to equally shaped contiguous float64 arrays (kernel inputs)"""
+    coords = np.broadcast_arrays(*(np.atleast_1d(np.asarray(c, dtype=np.float64))
+                                   for c in (lat1, lon1, lat2, lon2)))
+    return tuple(np.ascontiguousarray(c) for c in coords)
+
+
+# Prepared offing buffers around the land union, keyed by (coastline source, offing in degrees).
+# Buffering the full coastline takes seconds, so it is done once per process, not per point.
+_LAND_BUFFERS: Dict[Tuple[str, float], Any] = {}
+
+
+# Legs shorter than this are interpolated on a flat-earth (equirectangular) approximation
+FLAT_EARTH_MAX_NM = 50.0
+
+
+def interpolate_great_circle_vec(lat1: float, lon1: float, lat2: float, lon2: float,
+                                 fractions) -> np.ndarray:
+    """Positions at the given fractions (0-1) of the great circle, as an (N, 2) lat/lon array"""
+    lat1_rad, lon1_rad = math.radians(lat1), math.radians(lon1)
+    lat2_rad, lon2_rad = math.radians(lat2), math.radians(lon2)
+
+    # Angular distance (haversine)
+    a = (math.sin((lat2_rad - lat1_rad) / 2) ** 2
+         + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin((lon2_rad - lon1_rad) / 2) ** 2)
+    angular_distance = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    fractions = np.atleast_1d(np.asarray(fractions, dtype=np.float64))
+    positions = np.empty((len(fractions), 2), dtype=np.float64)
+
+    if angular_distance * settings.EARTH_RADIUS_NM < FLAT_EARTH_MAX_NM:
+        # Short leg: equirectangular (linear lat/lon) steps, no trig per position
+        dlon = (lon2 - lon1 + 180) % 360 - 180  # shortest way across the antimeridian
+        positions[:, 0] = lat1 + fractions * (lat2 - lat1)
+        positions[:, 1] = (lon1 + fractions * dlon + 180) % 360 - 180
+        return positions
+
+    wa = np.sin((1 - fractions) * angular_distance) / math.sin(angular_distance)
+    wb = np.sin(fractions * angular_distance) / math.sin(angular_distance)
+
+    x = wa * math.cos(lat1_rad) * math.cos(lon1_rad) + wb * math.cos(lat2_rad) * math.cos(lon2_rad)
+    y = wa * math.cos(lat1_rad) * math.sin(lon1_rad) + wb * math.cos(lat2_rad) * math.sin(lon2_rad)
+    z = wa * math.sin(lat1_rad) + wb * math.sin(lat2_rad)
+
+    positions[:, 0] = np.degrees(np.arctan2(z, np.sqrt(x ** 2 + y ** 2)))
+    positions[:, 1] = np.degrees(np.arctan2(y, x))
+    return positions
+
+
+@lru_cache(maxsize=128)
+def _great_circle_track(lat1: float, lon1: float, lat2: float, lon2: float,
+                        num_waypoints: int) -> np.ndarray:
+    """Intermediate great circle positions as a read-only (N, 2) lat/lon array (cached)"""
+    fractions = np.arange(1, num_waypoints + 1) / (num_waypoints + 1)
+    track = interpolate_great_circle_vec(lat1, lon1, lat2, lon2, fractions)
+    track.flags.writeable = False  # shared by every caller of the cache
+    return track
+
 
 class EnhancedSailingCalculator:
     """Enhanced sailing calculations for maritime route optimization"""
 
     def __init__(self, settings_obj):
-        self.db = DatabaseManager()
+        self.db = get_database_manager()
         self.settings = settings_obj  # Store the settings object
         self.earth_radius = self.settings.EARTH_RADIUS_NM  # Nautical miles
         
@@ -78,8 +256,7 @@ class EnhancedSailingCalculator:
         if not file_path.exists():
             return geoms
         try:
-            with open(file_path, "r") as f:
-                geo = json.load(f)
+            geo = _load_json_file(file_path)
             if "features" in geo:
                 for feat in geo.get("features", []):
                     if feat.get("geometry"):
@@ -96,8 +273,12 @@ class EnhancedSailingCalculator:
         if not file_path.exists():
             return features_data
         try:
-            with open(file_path, "r") as f:
-                geo = json.load(f)
+            if file_path.suffix == ".ndjson":
+                # Newline-delimited layer written by enc_loader: one feature per line
+                with open(file_path, "r") as f:
+                    geo = [json.loads(line) for line in f if line.strip()]
+            else:
+                geo = _load_json_file(file_path)
             
             features_list = []
             if isinstance(geo, dict) and "features" in geo:
@@ -115,38 +296,45 @@ class EnhancedSailingCalculator:
             print(f"Error loading GeoJSON features from {file_path}: {e}")
         return features_data
 
+    def calculate_great_circle_distance_vec(self, lat1, lon1, lat2, lon2) -> np.ndarray:
+        """Vectorized haversine distance in nautical miles over arrays of positions"""
+        return gc_distance_vec(*_position_arrays(lat1, lon1, lat2, lon2), self.earth_radius)
+
+    def calculate_bearing_vec(self, lat1, lon1, lat2, lon2) -> np.ndarray:
+        """Vectorized initial bearing in degrees (0-360) over arrays of positions"""
+        return bearing_vec(*_position_arrays(lat1, lon1, lat2, lon2))
+
+    def calculate_course_and_distance_vec(self, lat1, lon1, lat2, lon2) -> Tuple[np.ndarray, np.ndarray]:
+        """Initial bearing (degrees) and distance (nm) sharing one set of trig terms"""
+        return course_and_distance_vec(*_position_arrays(lat1, lon1, lat2, lon2), self.earth_radius)
+
+    def calculate_course_and_distance(self, lat1: float, lon1: float,
+                                      lat2: float, lon2: float) -> Tuple[float, float]:
+        """Initial bearing in degrees and great circle distance in nautical miles"""
+        course, distance = course_and_distance(float(lat1), float(lon1), float(lat2), float(lon2),
+                                               self.earth_radius)
+        return float(course), float(distance)
+
+    def calculate_leg_distances(self, waypoints: Union[List[Waypoint], RouteArrays]) -> np.ndarray:
+        """Distances in nautical miles between consecutive waypoints"""
+        if len(waypoints) < 2:
+            return np.zeros(0)
+        if isinstance(waypoints, RouteArrays):
+            lat, lon = waypoints.lat, waypoints.lon
+        else:
+            coords = np.array([(wp.latitude, wp.longitude) for wp in waypoints], dtype=np.float64)
+            lat, lon = coords[:, 0], coords[:, 1]
+        return self.calculate_great_circle_distance_vec(lat[:-1], lon[:-1], lat[1:], lon[1:])
+
     def calculate_great_circle_distance(self, lat1: float, lon1: float,
                                       lat2: float, lon2: float) -> float:
         """Calculate great circle distance between two points in nautical miles"""
-        # Convert to radians
-        lat1_rad, lon1_rad = math.radians(lat1), math.radians(lon1)
-        lat2_rad, lon2_rad = math.radians(lat2), math.radians(lon2)
-
-        # Haversine formula
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-
-        a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-
-        return self.earth_radius * c
+        return float(gc_distance(float(lat1), float(lon1), float(lat2), float(lon2), self.earth_radius))
 
     def calculate_bearing(self, lat1: float, lon1: float,
                          lat2: float, lon2: float) -> float:
         """Calculate initial bearing from point 1 to point 2 in degrees"""
-        lat1_rad, lon1_rad = math.radians(lat1), math.radians(lon1)
-        lat2_rad, lon2_rad = math.radians(lat2), math.radians(lon2)
-
-        dlon = lon2_rad - lon1_rad
-
-        x = math.sin(dlon) * math.cos(lat2_rad)
-        y = math.cos(lat1_rad) * math.sin(lat2_rad) - math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(dlon)
-
-        bearing_rad = math.atan2(x, y)
-        bearing_deg = math.degrees(bearing_rad)
-
-        # Normalize to 0-360 degrees
-        return (bearing_deg + 360) % 360
+        return float(bearing(float(lat1), float(lon1), float(lat2), float(lon2)))
 
     def calculate_rhumb_line_distance(self, lat1: float, lon1: float,
                                     lat2: float, lon2: float) -> float:
@@ -178,8 +366,7 @@ class EnhancedSailingCalculator:
                                   end_lat: float, end_lon: float) -> float:
         """Calculate cross track error (distance from path) in nautical miles"""
         # Calculate distances
-        dist_to_end = self.calculate_great_circle_distance(current_lat, current_lon, end_lat, end_lon)
-        bearing_to_end = self.calculate_bearing(current_lat, current_lon, end_lat, end_lon)
+        bearing_to_end, dist_to_end = self.calculate_course_and_distance(current_lat, current_lon, end_lat, end_lon)
         bearing_path = self.calculate_bearing(start_lat, start_lon, end_lat, end_lon)
 
         # Calculate angle difference
@@ -204,10 +391,9 @@ class EnhancedSailingCalculator:
 
         waypoints: List[Waypoint] = [Waypoint(latitude=s_lat, longitude=s_lon, name="Departure")]
 
-        # Generate intermediate waypoints
-        for i in range(1, num_waypoints + 1):
-            fraction = i / (num_waypoints + 1)
-            lat, lon = self._interpolate_great_circle(s_lat, s_lon, e_lat, e_lon, fraction)
+        # Generate intermediate waypoints (track is cached per route definition)
+        track = _great_circle_track(s_lat, s_lon, e_lat, e_lon, num_waypoints)
+        for i, (lat, lon) in enumerate(track.tolist(), start=1):
             waypoints.append(Waypoint(latitude=lat, longitude=lon, name=f"WP{i}"))
 
         waypoints.append(Waypoint(latitude=e_lat, longitude=e_lon, name="Destination"))
@@ -236,23 +422,8 @@ class EnhancedSailingCalculator:
                                 lat2: float, lon2: float,
                                 fraction: float) -> Tuple[float, float]:
         """Interpolate position along great circle path"""
-        lat1_rad, lon1_rad = math.radians(lat1), math.radians(lon1)
-        lat2_rad, lon2_rad = math.radians(lat2), math.radians(lon2)
-
-        d = self.calculate_great_circle_distance(lat1, lon1, lat2, lon2)
-        angular_distance = d / self.earth_radius
-
-        a = math.sin((1 - fraction) * angular_distance) / math.sin(angular_distance)
-        b = math.sin(fraction * angular_distance) / math.sin(angular_distance)
-
-        x = a * math.cos(lat1_rad) * math.cos(lon1_rad) + b * math.cos(lat2_rad) * math.cos(lon2_rad)
-        y = a * math.cos(lat1_rad) * math.sin(lon1_rad) + b * math.cos(lat2_rad) * math.sin(lon2_rad)
-        z = a * math.sin(lat1_rad) + b * math.sin(lat2_rad)
-
-        lat_rad = math.atan2(z, math.sqrt(x**2 + y**2))
-        lon_rad = math.atan2(y, x)
-
-        return math.degrees(lat_rad), math.degrees(lon_rad)
+        lat, lon = interpolate_great_circle_vec(lat1, lon1, lat2, lon2, fraction)[0]
+        return float(lat), float(lon)
 
     def optimize_route(self, waypoints: List[Waypoint],
                       constraints: RouteConstraints,
@@ -260,19 +431,18 @@ class EnhancedSailingCalculator:
         """Optimize route based on constraints and objectives"""
         print(f"🧭 Optimizing route with {objective.value} objective...")
 
-        # Calculate total distance
-        total_distance = 0
-        for i in range(len(waypoints) - 1):
-            wp1, wp2 = waypoints[i], waypoints[i + 1]
-            distance = self.calculate_great_circle_distance(
-                wp1.latitude, wp1.longitude, wp2.latitude, wp2.longitude
-            )
-            wp1.distance_to_next_nm = distance
-            total_distance += distance
+        # Course and distance of every leg in one vectorized pass over the waypoint columns
+        track = RouteArrays.from_waypoints(waypoints)
+        lat, lon = track.lat, track.lon
+        leg_courses, leg_distances = self.calculate_course_and_distance_vec(lat[:-1], lon[:-1], lat[1:], lon[1:])
+        for wp, course, distance in zip(waypoints, leg_courses.tolist(), leg_distances.tolist()):
+            wp.course_deg = course
+            wp.distance_to_next_nm = distance
+        total_distance = float(leg_distances.sum())
 
         # Calculate estimated duration and fuel consumption
         estimated_duration, fuel_consumption = self._calculate_route_metrics(
-            waypoints, constraints, objective
+            leg_distances, constraints, objective
         )
 
         # Calculate safety score
@@ -292,33 +462,24 @@ class EnhancedSailingCalculator:
         print("✅ Route optimization complete!")
         return route
 
-    def _calculate_route_metrics(self, waypoints: List[Waypoint],
+    def _calculate_route_metrics(self, leg_distances: np.ndarray,
                                constraints: RouteConstraints,
                                objective: RouteObjective) -> Tuple[float, float]:
-        """Calculate route duration and fuel consumption"""
-        total_time = 0
-        total_fuel = 0
-
-        for i in range(len(waypoints) - 1):
-            wp1, wp2 = waypoints[i], waypoints[i + 1]
-            distance = wp1.distance_to_next_nm or 0
-
-            # Determine speed based on objective
-            if objective == RouteObjective.FUEL_EFFICIENCY:
-                speed = constraints.min_speed_knots + (constraints.max_speed_knots - constraints.min_speed_knots) * 0.7
-            elif objective == RouteObjective.TIME_OPTIMIZATION:
-                speed = constraints.max_speed_knots
-            elif objective == RouteObjective.SAFETY_FIRST:
-                speed = constraints.max_speed_knots * 0.8
-            else:  # BALANCED
-                speed = (constraints.min_speed_knots + constraints.max_speed_knots) / 2
-
-            # Calculate time and fuel
-            time_hours = distance / speed
-            fuel_tonnes = distance * 0.02  # Rough estimate: 20 tonnes per 1000 nm
-
-            total_time += time_hours
-            total_fuel += fuel_tonnes
+        """Calculate route duration and fuel consumption from precomputed leg distances"""
+        # Determine speed based on objective
+        if objective == RouteObjective.FUEL_EFFICIENCY:
+            speed = constraints.min_speed_knots + (constraints.max_speed_knots - constraints.min_speed_knots) * 0.7
+        elif objective == RouteObjective.TIME_OPTIMIZATION:
+            speed = constraints.max_speed_knots
+        elif objective == RouteObjective.SAFETY_FIRST:
+            speed = constraints.max_speed_knots * 0.8
+        else:  # BALANCED
+            speed = (constraints.min_speed_knots + constraints.max_speed_knots) / 2
+
+        # Calculate time and fuel (speed is constant over the route, so one sum suffices)
+        total_distance = float(np.sum(leg_distances))
+        total_time = total_distance / speed
+        total_fuel = total_distance * 0.02  # Rough estimate: 20 tonnes per 1000 nm
 
         return total_time, total_fuel
 
@@ -347,19 +508,28 @@ class EnhancedSailingCalculator:
                     adjusted.append(wp)
             return adjusted
 
-        adjusted: List[Waypoint] = []
-        for wp in waypoints:
-            p = Point(wp.longitude, wp.latitude)
-            # if inside land or within offing buffer -> push seaward
-            if self._point_in_land_buffer(p):
-                adjusted.append(self._move_offshore_geo(wp))
-            else:
-                adjusted.append(wp)
-        return adjusted
+        # One vectorized containment test for all waypoints against the prepared buffer
+        lons = np.fromiter((wp.longitude for wp in waypoints), dtype=np.float64, count=len(waypoints))
+        lats = np.fromiter((wp.latitude for wp in waypoints), dtype=np.float64, count=len(waypoints))
+        in_buffer = shapely.contains_xy(self._land_buffer(), lons, lats)
+
+        # if inside land or within offing buffer -> push seaward
+        return [self._move_offshore_geo(wp) if inside else wp
+                for wp, inside in zip(waypoints, in_buffer.tolist())]
+
+    def _land_buffer(self):
+        """Land union buffered by the minimum offing (built and prepared once per process)"""
+        key = (str(self.coastlines_path), self.min_offing_deg)
+        buffer = _LAND_BUFFERS.get(key)
+        if buffer is None:
+            buffer = self._land_union.buffer(self.min_offing_deg)
+            shapely.prepare(buffer)
+            _LAND_BUFFERS[key] = buffer
+        return buffer
 
     def _point_in_land_buffer(self, p: Point) -> bool:
         """Check if point is within land buffer (offing distance)"""
-        return p.within(self._land_union.buffer(self.min_offing_deg))
+        return bool(shapely.contains_xy(self._land_buffer(), p.x, p.y))
 
     def _move_offshore_geo(self, waypoint: Waypoint) -> Waypoint:
         """Move waypoint seaward: away from nearest land boundary by required offing."""
@@ -434,26 +604,15 @@ class EnhancedSailingCalculator:
             estimated_time=waypoint.estimated_time
         )
 
-    def calculate_eta(self, start_time: datetime, waypoints: List[Waypoint],
-                     speed_knots: float) -> List[datetime]:
+    def calculate_eta(self, start_time: datetime, waypoints: Union[List[Waypoint], RouteArrays],
+                     speed_knots: float, leg_distances=None) -> List[datetime]:
         """Calculate estimated time of arrival for each waypoint"""
-        etas = [start_time]
-        current_time = start_time
-
-        for i in range(len(waypoints) - 1):
-            wp1, wp2 = waypoints[i], waypoints[i + 1]
-            distance = self.calculate_great_circle_distance(
-                wp1.latitude, wp1.longitude, wp2.latitude, wp2.longitude
-            )
-
-            # Calculate travel time
-            travel_time_hours = distance / speed_knots
-            travel_time = timedelta(hours=travel_time_hours)
-
-            current_time += travel_time
-            etas.append(current_time)
+        # Reuse leg distances already computed by optimize_route when given
+        if leg_distances is None:
+            leg_distances = self.calculate_leg_distances(waypoints)
 
-        return etas
+        elapsed_hours = np.cumsum(np.asarray(leg_distances, dtype=np.float64) / speed_knots)
+        return [start_time] + [start_time + timedelta(hours=h) for h in elapsed_hours.tolist()]
 
     # --- Chart loading and TSS preference ---
 
@@ -466,11 +625,9 @@ class EnhancedSailingCalculator:
                 cached_land_buffer_path = self.charts_dir / self.settings.CACHED_LAND_BUFFER_GEOJSON
 
                 if cached_land_buffer_path.exists():
-                    with open(cached_land_buffer_path, "r") as f:
-                        self._land_union = shape(json.load(f))
+                    self._land_union = shape(_load_json_file(cached_land_buffer_path))
                 else:
-                    with open(self.coastlines_path, "r") as f:
-                        geo = json.load(f)
+                    geo = _load_json_file(self.coastlines_path)
                     geoms = []
                     if "features" in geo:
                         for feat in geo.get("features", []):
@@ -491,8 +648,7 @@ class EnhancedSailingCalculator:
                             json.dump(self._land_union.__geo_interface__, f)
 
             if self.mdata_path.exists():
-                with open(self.mdata_path, "r") as f:
-                    mdata = json.load(f)
+                mdata = _load_json_file(self.mdata_path)
 
                 # Load TSS corridors
                 tss_file = mdata.get("tss_corridors_file")
@@ -554,16 +710,15 @@ class EnhancedSailingCalculator:
         p = Point(lon, lat)
         if not any(p.within(poly) for poly in self._pilotage_zones):
             return lat, lon
-        # find nearest buoy by GC distance
-        best = (lat, lon, float("inf"))
-        for b in self._sea_buoys:
-            blat, blon = b.get("latitude"), b.get("longitude")
-            if blat is None or blon is None:
-                continue
-            d = self.calculate_great_circle_distance(lat, lon, blat, blon)
-            if d < best[2]:
-                best = (blat, blon, d)
-        return best[0], best[1]
+        # find nearest buoy by GC distance (one vectorized pass over all buoys)
+        buoys = np.array([(b.get("latitude"), b.get("longitude")) for b in self._sea_buoys
+                          if b.get("latitude") is not None and b.get("longitude") is not None],
+                         dtype=np.float64).reshape(-1, 2)
+        if not len(buoys):
+            return lat, lon
+        distances = self.calculate_great_circle_distance_vec(lat, lon, buoys[:, 0], buoys[:, 1])
+        blat, blon = buoys[int(np.argmin(distances))]
+        return float(blat), float(blon)
 
     def _prefer_tss_corridors(self, waypoints: List[Waypoint]) -> List[Waypoint]:
         """Bias near-approach segments to corridor centerlines; optionally enforce one-way."""
@@ -775,14 +930,9 @@ class EnhancedSailingCalculator:
         if vessel is None:
             vt = 0 # Default to unknown vessel type
         else:
-            vt = (vessel.vessel_type or 0)
+            vt = int(vessel.vessel_type or 0)
         
-        if vt in (62, 64):        # cargo, tanker
-            coeff = 1.0
-        elif vt in (60, 40):      # passenger, HSC
-            coeff = 0.6
-        else:
-            coeff = 0.8 if vt else 0.7
+        coeff = float(_SQUAT_COEFF[vt]) if 0 <= vt < 100 else 0.8
         return coeff * (v * v) / 100.0
 
     def _required_depth_m(self, vessel: Optional[VesselData], speed_knots: float, ukc_m: float) -> float:
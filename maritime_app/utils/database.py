@@ -2,15 +2,84 @@
 Database Utilities Module
 Handles database connections and operations for maritime data
 """
+import atexit
 import sqlite3
+import threading
 import pandas as pd
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from contextlib import contextmanager
+from functools import lru_cache
 
 from ..config.settings import settings
 from ..core.models import VesselData, WeatherData, RouteOptimizationResult
 
+# Per-connection tuning: WAL appends instead of fsync-per-commit, larger page cache
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "busy_timeout=5000",
+    "cache_size=-20000",
+    "temp_store=MEMORY",
+)
+
+# One open connection per (thread, database file), reused across DatabaseManager calls
+_thread_connections = threading.local()
+_open_connections: List[sqlite3.Connection] = []
+_open_connections_lock = threading.Lock()
+
+
+def _cached_connection(db_path: str) -> sqlite3.Connection:
+    """This thread's connection to db_path, opened and tuned on first use"""
+    connections = getattr(_thread_connections, 'by_path', None)
+    if connections is None:
+        connections = _thread_connections.by_path = {}
+
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
+        connections[db_path] = conn
+        with _open_connections_lock:
+            _open_connections.append(conn)
+    return conn
+
+
+@atexit.register
+def _close_cached_connections():
+    """Close every cached connection at interpreter exit"""
+    with _open_connections_lock:
+        for conn in _open_connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass  # owned by another thread; the OS reclaims it on exit
+        _open_connections.clear()
+
+
+# Columns projected by the DataFrame readers (only what the pipeline consumes)
+WEATHER_FRAME_COLUMNS = (
+    "latitude", "longitude", "wave_height_m", "wind_speed_kts", "wind_direction_deg",
+    "temperature_c", "ocean_current_speed_kts", "ocean_current_direction_deg",
+    "forecast_time AS timestamp",
+)
+VESSEL_FRAME_COLUMNS = (
+    "v.mmsi", "v.name", "vp.latitude", "vp.longitude", "vp.speed", "vp.course",
+    "vp.heading", "vp.timestamp",
+)
+
+# DataFrame columns feeding the vessels / vessel_positions inserts (speed doubles as SOG and STW)
+VESSEL_ROW_COLUMNS = ("mmsi", "name", "vessel_type", "length", "width", "draft")
+POSITION_ROW_COLUMNS = ("mmsi", "latitude", "longitude", "speed", "course", "heading",
+                        "speed", "speed", "timestamp")
+
+
+def _frame_column_names(columns: Tuple[str, ...]) -> List[str]:
+    """Result column names for a projection list (alias or bare column)"""
+    return [col.split(" AS ")[-1].split(".")[-1] for col in columns]
+
 
 class DatabaseManager:
     """Manages database connections and operations"""
@@ -136,88 +205,113 @@ class DatabaseManager:
 
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Context manager for database connections (cached per thread, not closed on exit)"""
+        conn = _cached_connection(self.db_path)
         try:
             yield conn
-        finally:
-            conn.close()
+        except Exception:
+            # Don't leave a half-finished transaction on the shared connection
+            conn.rollback()
+            raise
 
-    def save_vessel_data(self, vessels: List[VesselData]) -> int:
+    def save_vessel_data(self, vessels: List[VesselData], chunk_size: int = 10_000) -> int:
         """Save vessel data to database"""
+        updated_at = datetime.now()
+        vessel_rows = [
+            (v.mmsi, v.name, v.vessel_type, v.length, v.width, v.draft, updated_at)
+            for v in vessels
+        ]
+        # SOG and STW placeholders use speed
+        position_rows = [
+            (v.mmsi, v.latitude, v.longitude, v.speed, v.course, v.heading,
+             v.speed, v.speed, v.timestamp)
+            for v in vessels
+        ]
+        return self._insert_vessel_rows(vessel_rows, position_rows, chunk_size)
+
+    def save_vessel_frame(self, df: pd.DataFrame, chunk_size: int = 10_000) -> int:
+        """Save a DataFrame of vessel positions (rows go straight from itertuples to executemany)"""
+        frame = df.reindex(columns=list(dict.fromkeys(VESSEL_ROW_COLUMNS + POSITION_ROW_COLUMNS)))
+        if pd.api.types.is_datetime64_any_dtype(frame['timestamp']):
+            # sqlite3 has no adapter for pd.Timestamp; store the same ISO text as datetime values
+            frame['timestamp'] = frame['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S.%f')
+        frame = frame.astype(object).where(frame.notna(), None)
+
+        updated_at = datetime.now()
+        vessel_rows = [row + (updated_at,) for row in
+                       frame[list(VESSEL_ROW_COLUMNS)].itertuples(index=False, name=None)]
+        position_rows = list(frame[list(POSITION_ROW_COLUMNS)].itertuples(index=False, name=None))
+        return self._insert_vessel_rows(vessel_rows, position_rows, chunk_size)
+
+    def _insert_vessel_rows(self, vessel_rows: List[Tuple], position_rows: List[Tuple],
+                            chunk_size: int) -> int:
+        """Insert prepared vessel and position rows"""
         saved_count = 0
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            for vessel in vessels:
+            # One executemany per table per chunk, each chunk in a single transaction
+            for start in range(0, len(vessel_rows), chunk_size):
+                stop = start + chunk_size
                 try:
                     # Insert or update vessel info
-                    cursor.execute('''
+                    cursor.executemany('''
                         INSERT OR REPLACE INTO vessels
                         (mmsi, name, vessel_type, length, width, draft, updated_at)
                         VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        vessel.mmsi, vessel.name, vessel.vessel_type,
-                        vessel.length, vessel.width, vessel.draft,
-                        datetime.now()
-                    ))
+                    ''', vessel_rows[start:stop])
 
                     # Insert position data
-                    cursor.execute('''
+                    cursor.executemany('''
                         INSERT INTO vessel_positions
                         (mmsi, latitude, longitude, speed, course, heading,
                          sog, stw, timestamp)
                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        vessel.mmsi, vessel.latitude, vessel.longitude,
-                        vessel.speed, vessel.course, vessel.heading,
-                        vessel.speed, vessel.speed,  # SOG and STW placeholder
-                        vessel.timestamp
-                    ))
+                    ''', position_rows[start:stop])
 
-                    saved_count += 1
+                    conn.commit()
+                    saved_count += len(vessel_rows[start:stop])
 
                 except Exception as e:
-                    print(f"Error saving vessel {vessel.mmsi}: {e}")
-
-            conn.commit()
+                    conn.rollback()
+                    print(f"Error saving vessel batch: {e}")
 
         return saved_count
 
-    def save_weather_data(self, weather_data: List[WeatherData]) -> int:
+    def save_weather_data(self, weather_data: List[WeatherData], chunk_size: int = 10_000) -> int:
         """Save weather data to database"""
         saved_count = 0
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            for weather in weather_data:
+            # One executemany per chunk, each chunk in a single transaction
+            for start in range(0, len(weather_data), chunk_size):
+                chunk = weather_data[start:start + chunk_size]
                 try:
-                    cursor.execute('''
+                    cursor.executemany('''
                         INSERT INTO weather_forecasts
                         (latitude, longitude, forecast_time, wave_height_m,
                          wind_speed_kts, wind_direction_deg, temperature_c,
                          pressure_hpa, ocean_current_speed_kts,
                          ocean_current_direction_deg)
                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        weather.latitude, weather.longitude,
-                        weather.forecast_time, weather.wave_height_m,
-                        weather.wind_speed_kts, weather.wind_direction_deg,
-                        weather.temperature_c, weather.pressure_hpa,
-                        weather.ocean_current_speed_kts,
-                        weather.ocean_current_direction_deg
-                    ))
+                    ''', [
+                        (w.latitude, w.longitude, w.forecast_time, w.wave_height_m,
+                         w.wind_speed_kts, w.wind_direction_deg, w.temperature_c,
+                         w.pressure_hpa, w.ocean_current_speed_kts,
+                         w.ocean_current_direction_deg)
+                        for w in chunk
+                    ])
 
-                    saved_count += 1
+                    conn.commit()
+                    saved_count += len(chunk)
 
                 except Exception as e:
+                    conn.rollback()
                     print(f"Error saving weather data: {e}")
 
-            conn.commit()
-
         return saved_count
 
     def save_route_result(self, result: RouteOptimizationResult) -> int:
@@ -328,6 +422,42 @@ class DatabaseManager:
 
         return weather_data
 
+    def _read_frame(self, query: str, params: Tuple, columns: Tuple[str, ...],
+                    chunksize: int) -> pd.DataFrame:
+        """Stream a query into one DataFrame chunk by chunk"""
+        with self._get_connection() as conn:
+            # Stored text mixes 'YYYY-MM-DD HH:MM:SS' and '...SS.ffffff'; ISO8601 accepts both
+            chunks = list(pd.read_sql_query(query, conn, params=params, chunksize=chunksize,
+                                            parse_dates={'timestamp': {'format': 'ISO8601'}}))
+        if not chunks:
+            return pd.DataFrame(columns=_frame_column_names(columns))
+        return pd.concat(chunks, ignore_index=True)
+
+    def get_weather_forecast_df(self, lat: float, lon: float, hours_ahead: int = 24,
+                                chunksize: int = 50_000) -> pd.DataFrame:
+        """Get weather forecast for location as a DataFrame"""
+        query = f'''
+            SELECT {', '.join(WEATHER_FRAME_COLUMNS)} FROM weather_forecasts
+            WHERE latitude BETWEEN ? AND ?
+              AND longitude BETWEEN ? AND ?
+              AND forecast_time >= datetime('now')
+              AND forecast_time <= datetime('now', ?)
+            ORDER BY forecast_time
+        '''
+        params = (lat-1, lat+1, lon-1, lon+1, f'+{int(hours_ahead)} hours')
+        return self._read_frame(query, params, WEATHER_FRAME_COLUMNS, chunksize)
+
+    def get_recent_vessels_df(self, limit: int = 50, chunksize: int = 50_000) -> pd.DataFrame:
+        """Get recent vessel data as a DataFrame"""
+        query = f'''
+            SELECT {', '.join(VESSEL_FRAME_COLUMNS)}
+            FROM vessels v
+            JOIN vessel_positions vp ON v.mmsi = vp.mmsi
+            ORDER BY vp.timestamp DESC
+            LIMIT ?
+        '''
+        return self._read_frame(query, (limit,), VESSEL_FRAME_COLUMNS, chunksize)
+
     def get_vessel_performance_history(self, mmsi: int,
                                      limit: int = 100) -> List[Dict[str, Any]]:
         """Get vessel performance history"""
@@ -376,3 +506,13 @@ class DatabaseManager:
 
             deleted_count = cursor.rowcount
             print(f"🧹 Cleaned up {deleted_count} old records")
+
+
+@lru_cache(maxsize=None)
+def _shared_database_manager(db_path: str) -> DatabaseManager:
+    return DatabaseManager(db_path)
+
+
+def get_database_manager(db_path: str = None) -> DatabaseManager:
+    """Process-wide DatabaseManager for a database path (schema setup runs once)"""
+    return _shared_database_manager(db_path or settings.DATABASE_PATH)
@@ -0,0 +1,60 @@
+"""
+Spatial Index Module
+Nearest-point and bounding-box queries over fixed lat/lon positions
+"""
+import numpy as np
+from typing import Dict, Sequence
+
+# Optional R-tree support via libspatialindex (graceful fallback if unavailable)
+try:
+    from rtree import index as rtree_index
+    RTREE_AVAILABLE = True
+except ImportError:
+    RTREE_AVAILABLE = False
+
+# KD-tree fallback for nearest-point queries
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+class SpatialIndex:
+    """R-tree over point positions, with KD-tree and NumPy scan fallbacks"""
+
+    def __init__(self, lats: Sequence[float], lons: Sequence[float]):
+        self._lats = np.asarray(lats, dtype=np.float64)
+        self._lons = np.asarray(lons, dtype=np.float64)
+        self._tree = None
+        self._kdtree = None
+
+        if RTREE_AVAILABLE and len(self._lats):
+            # Stream (bulk) loading builds a better-packed tree than repeated inserts
+            self._tree = rtree_index.Index(
+                (i, (lon, lat, lon, lat), None)
+                for i, (lat, lon) in enumerate(zip(self._lats.tolist(), self._lons.tolist()))
+            )
+        elif SCIPY_AVAILABLE and len(self._lats):
+            self._kdtree = cKDTree(np.column_stack((self._lats, self._lons)))
+
+    def __len__(self) -> int:
+        return len(self._lats)
+
+    def nearest(self, lat: float, lon: float) -> int:
+        """Position index of the point nearest to (lat, lon)"""
+        if self._tree is not None:
+            return int(next(self._tree.nearest((lon, lat, lon, lat), 1)))
+        if self._kdtree is not None:
+            return int(self._kdtree.query((lat, lon), k=1)[1])
+        return int(np.argmin((self._lats - lat) ** 2 + (self._lons - lon) ** 2))
+
+    def within(self, bounds: Dict[str, float]) -> np.ndarray:
+        """Position indices inside a north/south/east/west bounding box"""
+        if self._tree is not None:
+            hits = self._tree.intersection((bounds['west'], bounds['south'],
+                                            bounds['east'], bounds['north']))
+            return np.sort(np.fromiter(hits, dtype=np.intp))
+        mask = ((self._lats >= bounds['south']) & (self._lats <= bounds['north']) &
+                (self._lons >= bounds['west']) & (self._lons <= bounds['east']))
+        return np.flatnonzero(mask)
@@ -2,7 +2,7 @@
 Visualization Utilities Module
 Handles plotting and visualization for maritime data analysis
 """
-import matplotlib.pyplot as plt
+import matplotlib
 import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Optional, Tuple
@@ -14,8 +14,25 @@ try:
 except ImportError:
     HAS_SEABORN = False
 
+from ..config.settings import settings
 from ..core.models import Route, VesselData, WeatherData, RouteOptimizationResult
 
+# Batch runs render off-screen; the GUI backend is only needed for interactive sessions
+if not settings.PLOT_INTERACTIVE:
+    matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+
+def reusable_figure(name: str, **figure_kw):
+    """Figure registered under name, cleared and reused on later calls instead of reallocated"""
+    return plt.figure(num=name, clear=True, **figure_kw)
+
+
+def show_figure(fig):
+    """Show the figure in interactive sessions (batch runs keep it for reuse)"""
+    if settings.PLOT_INTERACTIVE:
+        plt.show()
+
 
 class MaritimeVisualizer:
     """Handles visualization of maritime data and analysis results"""
@@ -45,19 +62,22 @@ class MaritimeVisualizer:
     def plot_route_analysis(self, route: Route, weather_data: List[WeatherData] = None,
                            save_path: str = "enhanced_maritime_analysis.png"):
         """Create comprehensive route analysis visualization"""
-        fig = plt.figure(figsize=(16, 12))
+        fig = reusable_figure('route_analysis', figsize=(16, 12))
         fig.suptitle('🚢 Enhanced Maritime Route Analysis', fontsize=16, fontweight='bold')
 
         # Create subplots
         gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
 
+        # Waypoint columns gathered once and shared by the panels
+        track = self._route_arrays(route)
+
         # 1. Route Map
         ax1 = fig.add_subplot(gs[0, :2])
-        self._plot_route_map(ax1, route)
+        self._plot_route_map(ax1, route, track)
 
         # 2. Speed Profile
         ax2 = fig.add_subplot(gs[0, 2])
-        self._plot_speed_profile(ax2, route)
+        self._plot_speed_profile(ax2, track)
 
         # 3. Fuel Consumption Analysis
         ax3 = fig.add_subplot(gs[1, 0])
@@ -76,18 +96,22 @@ class MaritimeVisualizer:
         self._plot_performance_summary(ax6, route)
 
         plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.show()
+        fig.savefig(save_path, dpi=settings.PLOT_DPI, bbox_inches='tight')
+        show_figure(fig)
 
         print(f"📊 Enhanced maritime analysis saved as {save_path}")
 
-    def _plot_route_map(self, ax, route: Route):
+    def _route_arrays(self, route: Route) -> Dict[str, np.ndarray]:
+        """Waypoint latitude, longitude and leg distance columns in a single pass"""
+        arrays = route.to_arrays()
+        return {'lat': arrays.lat, 'lon': arrays.lon, 'leg_nm': np.nan_to_num(arrays.dist[:-1])}
+
+    def _plot_route_map(self, ax, route: Route, track: Dict[str, np.ndarray]):
         """Plot route map with waypoints"""
         ax.set_title('🗺️ Route Map', fontweight='bold')
 
         # Extract coordinates
-        lats = [wp.latitude for wp in route.waypoints]
-        lons = [wp.longitude for wp in route.waypoints]
+        lats, lons = track['lat'], track['lon']
 
         # Plot route line
         ax.plot(lons, lats, 'b-', linewidth=2, alpha=0.7, label='Route')
@@ -96,8 +120,8 @@ class MaritimeVisualizer:
         ax.scatter(lons, lats, c='red', s=50, zorder=5, label='Waypoints')
 
         # Add waypoint labels
-        for i, wp in enumerate(route.waypoints):
-            ax.annotate(wp.name, (lons[i], lats[i]),
+        for wp, lon, lat in zip(route.waypoints, lons.tolist(), lats.tolist()):
+            ax.annotate(wp.name, (lon, lat),
                        xytext=(5, 5), textcoords='offset points',
                        fontsize=8, bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7))
 
@@ -106,19 +130,14 @@ class MaritimeVisualizer:
         ax.grid(True, alpha=0.3)
         ax.legend()
 
-    def _plot_speed_profile(self, ax, route: Route):
+    def _plot_speed_profile(self, ax, track: Dict[str, np.ndarray]):
         """Plot speed profile along route"""
         ax.set_title('⏱️ Speed Profile', fontweight='bold')
 
-        distances = [0]
-        speeds = [12.0]  # Default speed
-
-        cumulative_distance = 0
-        for wp in route.waypoints[:-1]:
-            if wp.distance_to_next_nm:
-                cumulative_distance += wp.distance_to_next_nm
-                distances.append(cumulative_distance)
-                speeds.append(12.0)  # Placeholder
+        # Cumulative distance at each measured leg end
+        legs = track['leg_nm'][track['leg_nm'] > 0]
+        distances = np.concatenate(([0.0], np.cumsum(legs)))
+        speeds = np.full(len(distances), 12.0)  # Placeholder default speed
 
         ax.plot(distances, speeds, 'g-', linewidth=2, marker='o')
         ax.fill_between(distances, speeds, alpha=0.3, color='green')
@@ -178,9 +197,10 @@ class MaritimeVisualizer:
         ax.set_title('🌊 Weather Impact', fontweight='bold')
 
         if weather_data:
-            # Extract weather data
-            wave_heights = [w.wave_height_m or 1.5 for w in weather_data[:10]]
-            wind_speeds = [w.wind_speed_kts or 15 for w in weather_data[:10]]
+            # Extract weather data (both series in one pass)
+            wave_heights, wind_speeds = np.array(
+                [(w.wave_height_m or 1.5, w.wind_speed_kts or 15) for w in weather_data[:10]]
+            ).T
 
             x = range(len(wave_heights))
 
@@ -228,7 +248,8 @@ class MaritimeVisualizer:
     def plot_vessel_distribution(self, vessels: List[VesselData],
                                save_path: str = "vessel_distribution.png"):
         """Plot vessel distribution and types"""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10))
+        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10),
+                                                     num='vessel_distribution', clear=True)
         fig.suptitle('🚢 Vessel Distribution Analysis', fontsize=16, fontweight='bold')
 
         # Vessel types distribution
@@ -270,15 +291,15 @@ class MaritimeVisualizer:
             ax4.grid(True, alpha=0.3)
 
         plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.show()
+        fig.savefig(save_path, dpi=settings.PLOT_DPI, bbox_inches='tight')
+        show_figure(fig)
 
         print(f"📊 Vessel distribution analysis saved as {save_path}")
 
     def plot_ml_model_performance(self, training_results: Dict[str, float],
                                 save_path: str = "ml_performance.png"):
         """Plot ML model performance metrics"""
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5), num='ml_performance', clear=True)
         fig.suptitle('🤖 ML Model Performance Analysis', fontsize=16, fontweight='bold')
 
         # R² Scores
@@ -328,7 +349,7 @@ class MaritimeVisualizer:
                 bbox=dict(boxstyle='round,pad=0.5', facecolor='lightyellow', alpha=0.8))
 
         plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.show()
+        fig.savefig(save_path, dpi=settings.PLOT_DPI, bbox_inches='tight')
+        show_figure(fig)
 
         print(f"🤖 ML performance analysis saved as {save_path}")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the AIS collector: columnar store, DataFrame export and the asyncio receive loop
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("AISSTREAM_API_KEY", "test")
+os.environ.setdefault("TOMORROW_IO_API_KEY", "test")
+
+import numpy as np
+
+from maritime_app.core.models import VesselData
+from maritime_app.data.collectors import ais_collector
+from maritime_app.data.collectors.ais_collector import AISDataCollector
+
+BOUNDS = {"north": 38.5, "south": 36.5, "east": -121.5, "west": -123.5}
+
+
+def make_collector(**kwargs) -> AISDataCollector:
+    return AISDataCollector(api_key="test", bounds=BOUNDS, **kwargs)
+
+
+def positions_frame(*mmsis) -> str:
+    return json.dumps({"msg_type": "positions",
+                       "positions": [{"mmsi": m, "lat": 37.5, "lon": -122.5, "timestamp": 0}
+                                     for m in mmsis]})
+
+
+class FakeStream:
+    """Stands in for the AIS WebSocket: replays frames, then stays open silently"""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.sent = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    def __aiter__(self):
+        return self._frames()
+
+    async def _frames(self):
+        for frame in self.frames:
+            yield frame
+        await asyncio.Event().wait()
+
+
+def use_stream(monkeypatch, frames) -> FakeStream:
+    stream = FakeStream(frames)
+    monkeypatch.setattr(ais_collector.websockets, "connect", lambda *args, **kwargs: stream)
+    return stream
+
+
+def test_positions_keep_full_precision():
+    """Latitude/longitude survive the columnar store and DataFrame export unrounded"""
+    collector = make_collector(max_vessels=10)
+    collector._store_vessels([VesselData(mmsi=1, name="A", latitude=37.7749123, longitude=-122.4194567,
+                                         speed=12.5, course=45.0)])
+    df = collector.to_dataframe()
+    assert df["latitude"].dtype == np.float64
+    assert df["latitude"].iloc[0] == 37.7749123
+    assert df["longitude"].iloc[0] == -122.4194567
+
+
+def test_dataframe_does_not_share_collector_buffers():
+    """Editing the exported frame leaves the collector's arrays untouched"""
+    collector = make_collector(max_vessels=10)
+    collector._store_vessels([VesselData(mmsi=1, latitude=37.5, longitude=-122.5)])
+    df = collector.to_dataframe()
+    df.loc[0, "latitude"] = 0.0
+    assert collector._lat[0] == 37.5
+    assert not np.shares_memory(df["longitude"].to_numpy(), collector._lon)
+
+
+def test_collection_stops_once_max_vessels_reached(monkeypatch):
+    """Reaching max_vessels ends collection well before the duration elapses"""
+    stream = use_stream(monkeypatch, [positions_frame(1, 2), positions_frame(3, 4)])
+    collector = make_collector(max_vessels=3)
+
+    started = time.monotonic()
+    vessels = collector.start_collection(duration_seconds=30)
+
+    assert time.monotonic() - started < 5
+    assert json.loads(stream.sent[0])["msg_type"] == "subscribe"
+    assert [v.mmsi for v in vessels] == [1, 2, 3, 4]
+    assert collector.get_vessel_count() == 3
+    assert not collector.running
+
+
+def test_collection_returns_on_timeout_without_messages(monkeypatch):
+    """A silent stream yields an empty result after the requested duration"""
+    use_stream(monkeypatch, [])
+    collector = make_collector(max_vessels=10)
+
+    started = time.monotonic()
+    vessels = collector.start_collection(duration_seconds=0.2)
+
+    assert vessels == []
+    assert 0.1 < time.monotonic() - started < 5
+    assert collector.get_vessel_count() == 0
+
+
+def test_full_queue_drops_positions():
+    """Positions beyond the queue bound are counted as dropped, not buffered"""
+    collector = make_collector(max_vessels=1)
+    collector._handle_message(positions_frame(*range(1, 8)))
+
+    assert collector.data_queue.qsize() == collector.data_queue.maxsize == 4
+    assert collector.dropped_messages == 3
+    assert not collector.running
+
+
+def test_prefilter_skips_frames_without_positions():
+    """Non-position frames never reach the queue"""
+    collector = make_collector(max_vessels=10)
+    collector._handle_message(json.dumps({"msg_type": "heartbeat"}))
+    collector._handle_message(positions_frame(5).encode())
+
+    assert collector.data_queue.qsize() == 1
+    assert collector.dropped_messages == 0
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-thread cached SQLite connections behind DatabaseManager
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("AISSTREAM_API_KEY", "test")
+os.environ.setdefault("TOMORROW_IO_API_KEY", "test")
+
+from maritime_app.utils import database
+from maritime_app.utils.database import DatabaseManager
+
+
+@pytest.fixture
+def isolated_connections(monkeypatch):
+    """Fresh connection cache, so closing it cannot affect other tests"""
+    monkeypatch.setattr(database, "_thread_connections", threading.local())
+    monkeypatch.setattr(database, "_open_connections", [])
+    yield
+    database._close_cached_connections()
+
+
+def test_connection_reused_per_thread_and_path(tmp_path, isolated_connections):
+    """One connection per (thread, file): reused in the thread, separate in another thread or file"""
+    db = DatabaseManager(str(tmp_path / "a.db"))
+    with db._get_connection() as first, db._get_connection() as second:
+        assert first is second
+
+    with DatabaseManager(str(tmp_path / "b.db"))._get_connection() as other_file:
+        assert other_file is not first
+
+    seen = []
+    def worker():
+        with db._get_connection() as conn:
+            seen.append(conn)
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert seen and seen[0] is not first
+
+
+def test_error_rolls_back_the_shared_connection(tmp_path, isolated_connections):
+    """An exception inside the block rolls back its uncommitted writes"""
+    db = DatabaseManager(str(tmp_path / "m.db"))
+    with pytest.raises(RuntimeError):
+        with db._get_connection() as conn:
+            conn.execute("INSERT INTO vessels (mmsi, name) VALUES (1, 'half-written')")
+            raise RuntimeError("boom")
+
+    with db._get_connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM vessels").fetchone()[0] == 0
+
+
+def test_close_cached_connections(tmp_path, isolated_connections):
+    """Every cached connection is closed and forgotten"""
+    db = DatabaseManager(str(tmp_path / "m.db"))
+    with db._get_connection() as conn:
+        pass
+    database._close_cached_connections()
+
+    assert database._open_connections == []
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+
+def test_connections_closed_at_interpreter_exit(tmp_path):
+    """The atexit hook closes the connection, which checkpoints and removes the WAL file"""
+    db_path = tmp_path / "exit.db"
+    script = (
+        "from maritime_app.utils.database import DatabaseManager\n"
+        f"db = DatabaseManager({str(db_path)!r})\n"
+        "with db._get_connection() as conn:\n"
+        "    conn.execute(\"INSERT INTO vessels (mmsi, name) VALUES (7, 'exit')\")\n"
+        "    conn.commit()\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=project_root, check=True, env=os.environ.copy())
+
+    assert not Path(f"{db_path}-wal").exists()
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT name FROM vessels WHERE mmsi = 7").fetchone() == ("exit",)
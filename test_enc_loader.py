@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the NOAA ENC layer loader: NDJSON layers, bbox index and region filtering
+"""
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("AISSTREAM_API_KEY", "test")
+os.environ.setdefault("TOMORROW_IO_API_KEY", "test")
+
+from maritime_app.charts.enc_loader import NOAAENCLoader, _index_paths, _stream_dump_features
+
+LAYER_PREFIXES = [prefix for _, _, prefix in NOAAENCLoader.LAYER_SPECS]
+
+# San Francisco, Paris, a feature without geometry, and a line crossing into the west coast box
+FEATURES = [
+    {"type": "Feature", "properties": {"name": "sf"},
+     "geometry": {"type": "Point", "coordinates": [-122.4, 37.8]}},
+    {"type": "Feature", "properties": {"name": "paris"},
+     "geometry": {"type": "Point", "coordinates": [2.35, 48.85]}},
+    {"type": "Feature", "properties": {"name": "no_geometry"}, "geometry": None},
+    {"type": "Feature", "properties": {"name": "crossing"},
+     "geometry": {"type": "LineString", "coordinates": [[-130.0, 40.0], [-125.0, 40.0]]}},
+]
+
+
+def make_loader(charts_dir: Path) -> NOAAENCLoader:
+    """Loader over a temporary charts directory holding the same legacy GeoJSON file for every layer"""
+    names = {}
+    for prefix in LAYER_PREFIXES:
+        names[f"{prefix}_GEOJSON"] = f"{prefix.lower()}.json"
+        names[f"{prefix}_NDJSON"] = f"{prefix.lower()}.ndjson"
+        (charts_dir / names[f"{prefix}_GEOJSON"]).write_text(
+            json.dumps({"type": "FeatureCollection", "features": FEATURES}))
+    settings_obj = SimpleNamespace(CHARTS_DIR=str(charts_dir), MAX_WORKERS=2, **names)
+    return NOAAENCLoader(settings_obj, cache_dir=charts_dir / "cache")
+
+
+def names_of(features):
+    return [feature["properties"]["name"] for feature in features]
+
+
+@pytest.mark.parametrize("region", [None, "west_coast", "east_coast", "us_full", "atlantis"])
+def test_region_filter_matches_before_and_after_ndjson_conversion(tmp_path, region):
+    """The legacy GeoJSON scan and the indexed NDJSON read return the same features for a region"""
+    loader = make_loader(tmp_path)
+    before = names_of(loader.load_sea_buoys(region))
+
+    loader.create_maritime_data_json("west_coast")
+    assert loader._layer_path("SEA_BUOYS").suffix == ".ndjson"
+    after = names_of(loader.load_sea_buoys(region))
+
+    assert before == after
+
+
+def test_region_filter_selects_overlapping_features(tmp_path):
+    """Features meeting the region bbox, plus those without geometry, are kept"""
+    loader = make_loader(tmp_path)
+    assert names_of(loader.load_sea_buoys()) == ["sf", "paris", "no_geometry", "crossing"]
+    assert names_of(loader.load_sea_buoys("west_coast")) == ["sf", "no_geometry", "crossing"]
+    assert names_of(loader.load_sea_buoys("east_coast")) == ["no_geometry"]
+
+
+def test_load_returns_new_lists_from_the_layer_cache(tmp_path):
+    """Each load_* call returns its own list; unchanged files are served from the cache"""
+    loader = make_loader(tmp_path)
+    first = loader.load_depth_areas()
+    assert isinstance(first, list)
+    first.clear()
+    assert names_of(loader.load_depth_areas()) == ["sf", "paris", "no_geometry", "crossing"]
+
+
+def test_ndjson_dump_writes_one_feature_per_line_with_index(tmp_path):
+    """_stream_dump_features writes NDJSON plus a bbox/offset index that addresses each line"""
+    out_path = tmp_path / "layer.ndjson"
+    assert _stream_dump_features(iter(FEATURES), out_path) == len(FEATURES)
+
+    raw = out_path.read_bytes()
+    assert [json.loads(line) for line in raw.splitlines()] == FEATURES
+    assert not (tmp_path / "layer.ndjson.tmp").exists()
+
+    bbox_path, offsets_path = _index_paths(out_path)
+    bboxes, offsets = np.load(bbox_path), np.load(offsets_path)
+    assert bboxes.shape == (len(FEATURES), 4) and bboxes.dtype == np.float32
+    assert offsets.shape == (len(FEATURES), 2) and offsets.dtype == np.int64
+    for feature, (offset, length) in zip(FEATURES, offsets.tolist()):
+        assert json.loads(raw[offset:offset + length]) == feature
+
+    np.testing.assert_allclose(bboxes[0], [-122.4, 37.8, -122.4, 37.8], rtol=1e-6)
+    np.testing.assert_allclose(bboxes[3], [-130.0, 40.0, -125.0, 40.0])
+    assert np.isnan(bboxes[2]).all()  # no geometry
+
+
+def test_stale_index_is_ignored(tmp_path):
+    """A layer rewritten after its index is read in full and filtered per feature, not through the old offsets"""
+    layer = tmp_path / "layer.ndjson"
+    _stream_dump_features(iter(FEATURES), layer)
+    assert NOAAENCLoader._region_rows(layer, "west_coast") is not None
+
+    # Rewrite the layer without touching the index: the offsets no longer match its lines
+    layer.write_text("\n".join(json.dumps(feature) for feature in reversed(FEATURES)) + "\n")
+    bbox_path, offsets_path = _index_paths(layer)
+    stale = layer.stat().st_mtime - 10
+    os.utime(bbox_path, (stale, stale))
+    os.utime(offsets_path, (stale, stale))
+
+    assert NOAAENCLoader._region_rows(layer, "west_coast") is None
+    assert names_of(NOAAENCLoader._iter_features(layer, "test", "west_coast")) == ["crossing", "no_geometry", "sf"]
+
+
+def test_missing_index_falls_back_to_scan(tmp_path):
+    """Without sidecar files the NDJSON layer is scanned line by line"""
+    layer = tmp_path / "layer.ndjson"
+    _stream_dump_features(iter(FEATURES), layer)
+    for path in _index_paths(layer):
+        path.unlink()
+
+    assert NOAAENCLoader._region_rows(layer, "west_coast") is None
+    assert names_of(NOAAENCLoader._iter_features(layer, "test", "west_coast")) == ["sf", "no_geometry", "crossing"]
+    assert names_of(NOAAENCLoader._iter_features(layer, "test")) == ["sf", "paris", "no_geometry", "crossing"]
@@ -75,5 +75,11 @@ def test_navigation_calculations():
     
     print(f"\n✅ All navigation tests completed successfully!")
 
+def test_normalize_bearing_range():
+    """Bearings wrap into [0, 360), including tiny negatives that round up to 360"""
+    nav = MaritimeNavigation()
+    for bearing, expected in [(0.0, 0.0), (360.0, 0.0), (-90.0, 270.0), (725.0, 5.0), (-1e-14, 0.0)]:
+        assert nav.normalize_bearing(bearing) == expected
+
 if __name__ == "__main__":
     test_navigation_calculations()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the RouteArrays column view and the route math that consumes it
+"""
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("AISSTREAM_API_KEY", "test")
+os.environ.setdefault("TOMORROW_IO_API_KEY", "test")
+
+import numpy as np
+import pytest
+
+from maritime_app.core.models import Route, RouteArrays, RouteConstraints, Waypoint
+from maritime_app.routing.route_optimizer import EnhancedSailingCalculator
+from maritime_app.config.settings import settings
+
+WAYPOINTS = [
+    Waypoint(latitude=37.8, longitude=-122.5, name="A", estimated_time=datetime(2026, 1, 1)),
+    Waypoint(latitude=34.0, longitude=-120.0, name="B", speed_knots=12.0),
+    Waypoint(latitude=33.7, longitude=-118.3, name="C"),
+]
+
+
+@pytest.fixture
+def calc(tmp_path, monkeypatch):
+    """Calculator backed by a throwaway database instead of data/maritime.db"""
+    monkeypatch.setattr(settings, "DATABASE_PATH", str(tmp_path / "maritime.db"))
+    return EnhancedSailingCalculator(settings)
+
+
+def test_from_waypoints_columns_and_missing_values():
+    """Columns carry the waypoint fields; unset values become NaN / NaT"""
+    arrays = RouteArrays.from_waypoints(WAYPOINTS)
+    assert len(arrays) == 3
+    np.testing.assert_array_equal(arrays.lat, [37.8, 34.0, 33.7])
+    assert arrays.lat.dtype == np.float64 and arrays.speed.dtype == np.float32
+    assert np.isnan(arrays.speed[0]) and arrays.speed[1] == 12.0
+    assert np.isnan(arrays.dist).all()
+    assert arrays.eta[0] == np.datetime64("2026-01-01T00:00:00")
+    assert np.isnat(arrays.eta[1:]).all()
+
+
+def test_from_waypoints_empty():
+    """An empty route gives empty columns"""
+    arrays = RouteArrays.from_waypoints([])
+    assert len(arrays) == 0 and arrays.eta.shape == (0,)
+
+
+def test_leg_distances_and_eta_match_between_list_and_arrays(calc):
+    """Leg distances and ETAs are the same from a waypoint list or its RouteArrays"""
+    route = Route(waypoints=WAYPOINTS, total_distance_nm=0.0, estimated_duration_hours=0.0,
+                  fuel_consumption_tonnes=0.0, safety_score=1.0, weather_impact_score=1.0)
+    arrays = route.to_arrays()
+
+    legs = calc.calculate_leg_distances(arrays)
+    np.testing.assert_allclose(legs, calc.calculate_leg_distances(WAYPOINTS))
+    np.testing.assert_allclose(
+        legs[0], calc.calculate_great_circle_distance(37.8, -122.5, 34.0, -120.0))
+
+    start = datetime(2026, 1, 1)
+    assert calc.calculate_eta(start, arrays, 12.0) == calc.calculate_eta(start, WAYPOINTS, 12.0)
+
+
+def test_optimize_route_fills_course_and_distance(calc):
+    """optimize_route stores every leg's course and distance on the waypoints"""
+    waypoints = [Waypoint(latitude=wp.latitude, longitude=wp.longitude, name=wp.name) for wp in WAYPOINTS]
+    route = calc.optimize_route(waypoints, RouteConstraints())
+    arrays = route.to_arrays()
+
+    course, distance = calc.calculate_course_and_distance(37.8, -122.5, 34.0, -120.0)
+    assert np.isclose(arrays.course[0], course, atol=1e-3)
+    assert np.isclose(arrays.dist[0], distance)
+    assert np.isclose(route.total_distance_nm, np.nansum(arrays.dist))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the route model training cache
+"""
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("AISSTREAM_API_KEY", "test")
+os.environ.setdefault("TOMORROW_IO_API_KEY", "test")
+
+import maritime_app
+from maritime_app import train_route_optimization_model
+
+
+def training_data(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(40, 4))
+    return X, X @ np.array([1.0, -2.0, 0.5, 3.0])
+
+
+@pytest.fixture(autouse=True)
+def empty_model_cache(monkeypatch):
+    monkeypatch.setattr(maritime_app, "_ROUTE_MODEL_CACHE", {})
+
+
+def test_cached_model_reused_for_same_data(tmp_path):
+    """Same training data returns the cached model, in process and from disk"""
+    X, y = training_data(0)
+    model, scaler = train_route_optimization_model(X, y, cache_path=str(tmp_path))
+    assert train_route_optimization_model(X, y, cache_path=str(tmp_path)) == (model, scaler)
+
+    maritime_app._ROUTE_MODEL_CACHE.clear()
+    loaded_model, loaded_scaler = train_route_optimization_model(X, y, cache_path=str(tmp_path))
+    np.testing.assert_allclose(loaded_model.predict(loaded_scaler.transform(X)),
+                               model.predict(scaler.transform(X)))
+
+
+def test_loaded_model_survives_retrain_to_same_file(tmp_path):
+    """A model loaded from disk keeps working after a retrain rewrites its cache file"""
+    X, y = training_data(0)
+    train_route_optimization_model(X, y, cache_path=str(tmp_path))
+    maritime_app._ROUTE_MODEL_CACHE.clear()
+    model, scaler = train_route_optimization_model(X, y, cache_path=str(tmp_path))
+
+    X_new, y_new = training_data(1)
+    train_route_optimization_model(X_new * 100, y_new, cache_path=str(tmp_path))
+
+    np.testing.assert_allclose(scaler.mean_, X.mean(axis=0))
+    assert np.isfinite(model.predict(scaler.transform(X))).all()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the frozen settings view used on hot paths
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("AISSTREAM_API_KEY", "test")
+os.environ.setdefault("TOMORROW_IO_API_KEY", "test")
+
+from dataclasses import FrozenInstanceError
+
+from maritime_app.config.settings import settings
+from maritime_app.charts.enc_loader import NOAAENCLoader
+
+
+def test_view_is_frozen_snapshot():
+    """The view mirrors the fields and cannot be written"""
+    view = settings.view
+    assert view.CHARTS_DIR == settings.CHARTS_DIR
+    assert view.MAX_WORKERS == settings.MAX_WORKERS
+    with pytest.raises(FrozenInstanceError):
+        view.MAX_WORKERS = 1
+
+
+def test_view_follows_model_copy_and_assignment(tmp_path):
+    """A copied or reassigned settings object yields a view with the new values"""
+    copied = settings.model_copy(update={"CHARTS_DIR": str(tmp_path), "MAX_WORKERS": 2})
+    assert copied.view.CHARTS_DIR == str(tmp_path)
+    assert copied.view.MAX_WORKERS == 2
+    assert settings.view.CHARTS_DIR == settings.CHARTS_DIR
+
+    copied.SEA_BUOYS_NDJSON = "buoys_test.ndjson"
+    assert copied.view.SEA_BUOYS_NDJSON == "buoys_test.ndjson"
+
+
+def test_loader_uses_the_settings_it_is_given(tmp_path):
+    """NOAAENCLoader takes charts_dir and layer names from one consistent snapshot"""
+    custom = settings.model_copy(update={"CHARTS_DIR": str(tmp_path), "SEA_BUOYS_NDJSON": "buoys_test.ndjson"})
+    (tmp_path / "buoys_test.ndjson").write_text("")
+    loader = NOAAENCLoader(custom, cache_dir=tmp_path / "cache")
+    assert loader.charts_dir == tmp_path
+    assert loader._layer_path("SEA_BUOYS") == tmp_path / "buoys_test.ndjson"
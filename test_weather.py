@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests for the weather helpers: combining sources, horizon validation and the response cache
+"""
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+os.environ.setdefault("AISSTREAM_API_KEY", "test")
+os.environ.setdefault("TOMORROW_IO_API_KEY", "test")
+
+import maritime_app
+from maritime_app import combine_weather_data, fetch_open_meteo_weather, fetch_tomorrow_io_weather
+
+
+@pytest.mark.parametrize("hours", [0, -5, maritime_app.MAX_FORECAST_HOURS + 1])
+def test_bad_forecast_horizon_reaches_the_caller(monkeypatch, hours):
+    """An out-of-range horizon raises before any request instead of becoming an empty frame"""
+    def no_network(url, params):
+        raise AssertionError("no request should be made")
+    monkeypatch.setattr(maritime_app, "_get_json", no_network)
+
+    with pytest.raises(ValueError):
+        fetch_open_meteo_weather(37.5, -122.5, hours=hours)
+    with pytest.raises(ValueError):
+        fetch_tomorrow_io_weather(37.5, -122.5, "key", hours=hours)
+
+
+def test_combine_weather_data_with_batched_open_meteo():
+    """A batched Open-Meteo frame repeats each hour per point; every row gets that hour's Tomorrow.io values"""
+    hours = pd.date_range("2026-01-01", periods=3, freq="h")
+    open_meteo = pd.DataFrame({
+        "time": hours.repeat(2),
+        "point_id": [0, 1] * 3,
+        "wave_height_m": [1.0, 2.0, 1.1, 2.1, 1.2, 2.2],
+    })
+    tomorrow = pd.DataFrame({
+        "time": hours.tz_localize("UTC")[:2],
+        "temperature_c": [15.0, 16.0],
+    })
+
+    combined = combine_weather_data(open_meteo, tomorrow)
+    assert len(combined) == 6
+    assert combined["point_id"].tolist() == [0, 1, 0, 1, 0, 1]
+    assert combined["temperature_c"].tolist()[:4] == [15.0, 15.0, 16.0, 16.0]
+    assert combined["temperature_c"].iloc[4:].isna().all()
+
+
+def test_combine_weather_data_suffixes_only_shared_columns():
+    """Columns present in both sources get a source suffix; the rest keep their names"""
+    hours = pd.date_range("2026-01-01", periods=2, freq="h")
+    combined = combine_weather_data(
+        pd.DataFrame({"time": hours, "wave_height_m": [1.0, 2.0], "latitude": [37.5, 37.5]}),
+        pd.DataFrame({"time": hours, "temperature_c": [15.0, 16.0], "latitude": [37.5, 37.5]}))
+    assert list(combined.columns) == ["time", "wave_height_m", "latitude_openmeteo",
+                                      "temperature_c", "latitude_tomorrow"]
+
+
+class FakeOpenMeteo:
+    """Counts requests and answers with a small hourly series (or nothing)"""
+
+    def __init__(self, empty=False):
+        self.calls = 0
+        self.empty = empty
+
+    def __call__(self, url, params):
+        self.calls += 1
+        if self.empty:
+            return {}
+        return {"hourly": {"time": ["2026-01-01T00:00", "2026-01-01T01:00"],
+                           "wave_height": [1.0, 1.5]}}
+
+
+@pytest.fixture
+def weather_api(monkeypatch):
+    """Empty cache, fake Open-Meteo and a controllable monotonic clock"""
+    api = FakeOpenMeteo()
+    clock = [1000.0]
+    monkeypatch.setattr(maritime_app, "_get_json", api)
+    monkeypatch.setattr(maritime_app.time, "monotonic", lambda: clock[0])
+    maritime_app._WEATHER_CACHE.clear()
+    yield api, clock
+    maritime_app._WEATHER_CACHE.clear()
+
+
+def test_weather_cache_hit_within_ttl(weather_api):
+    """Repeat requests for the same rounded point and horizon reuse the response"""
+    api, clock = weather_api
+    first = fetch_open_meteo_weather(37.5, -122.5)
+    clock[0] += maritime_app.settings.WEATHER_CACHE_TTL - 1
+    second = fetch_open_meteo_weather(37.501, -122.499)
+
+    assert api.calls == 1
+    assert second.equals(first)
+
+    fetch_open_meteo_weather(37.5, -122.5, hours=48)
+    assert api.calls == 2
+
+
+def test_weather_cache_returns_independent_copies(weather_api):
+    """Mutating a returned frame does not corrupt the cached one"""
+    first = fetch_open_meteo_weather(37.5, -122.5)
+    first.loc[0, "wave_height_m"] = 99.0
+
+    assert fetch_open_meteo_weather(37.5, -122.5).loc[0, "wave_height_m"] == 1.0
+
+
+def test_weather_cache_expires_after_ttl(weather_api):
+    """An entry older than WEATHER_CACHE_TTL is fetched again"""
+    api, clock = weather_api
+    fetch_open_meteo_weather(37.5, -122.5)
+    clock[0] += maritime_app.settings.WEATHER_CACHE_TTL
+    fetch_open_meteo_weather(37.5, -122.5)
+
+    assert api.calls == 2
+
+
+def test_weather_cache_skips_empty_results(weather_api):
+    """A failed fetch (empty frame) is retried on the next call"""
+    api, _ = weather_api
+    api.empty = True
+    assert fetch_open_meteo_weather(37.5, -122.5).empty
+    api.empty = False
+    assert not fetch_open_meteo_weather(37.5, -122.5).empty
+
+    assert api.calls == 2
+
+
+def test_weather_cache_evicts_least_recently_used(weather_api, monkeypatch):
+    """Past the size bound the least recently used entry goes first"""
+    api, _ = weather_api
+    monkeypatch.setattr(maritime_app, "_WEATHER_CACHE_MAXSIZE", 2)
+    fetch_open_meteo_weather(10.0, 10.0)
+    fetch_open_meteo_weather(20.0, 20.0)
+    fetch_open_meteo_weather(10.0, 10.0)  # refresh: 20,20 is now the oldest
+    fetch_open_meteo_weather(30.0, 30.0)
+    assert api.calls == 3
+
+    fetch_open_meteo_weather(10.0, 10.0)
+    assert api.calls == 3
+    fetch_open_meteo_weather(20.0, 20.0)
+    assert api.calls == 4
+
+
+def test_batched_open_meteo_keeps_position_precision(monkeypatch):
+    """Batched frames carry the requested positions as float64, readings as float32"""
+    def two_points(url, params):
+        return [{"hourly": {"time": ["2026-01-01T00:00"], "wave_height": [1.0]}}] * 2
+    monkeypatch.setattr(maritime_app, "_get_json", two_points)
+    maritime_app._WEATHER_CACHE.clear()
+
+    df = fetch_open_meteo_weather([37.7749, 36.1234567], [-122.4194, -121.7654321])
+    maritime_app._WEATHER_CACHE.clear()
+
+    assert df["latitude"].dtype == "float64"
+    assert df["latitude"].tolist() == [37.7749, 36.1234567]
+    assert df["longitude"].tolist() == [-122.4194, -121.7654321]
+    assert df["wave_height_m"].dtype == "float32"
+
+
+def test_weather_cache_concurrent_fetches(weather_api, monkeypatch):
+    """Threads hitting and evicting the cache together never corrupt it"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    monkeypatch.setattr(maritime_app, "_WEATHER_CACHE_MAXSIZE", 8)
+
+    def fetch(i):
+        return fetch_open_meteo_weather(30.0 + i % 20, -120.0)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        frames = list(pool.map(fetch, range(400)))
+
+    assert all(len(df) == 2 for df in frames)
+    assert len(maritime_app._WEATHER_CACHE) <= 8
@@ -59,6 +59,7 @@ from maritime_app import (
 
 # Configuration
 from maritime_app.config.settings import settings # Import settings
+from maritime_app.utils.spatial_index import SpatialIndex
 
 AISSTREAM_API_KEY = settings.AISSTREAM_API_KEY # Use settings for API key
 TOMORROW_IO_API_KEY = settings.TOMORROW_IO_API_KEY # Use settings for API key
@@ -80,8 +81,57 @@ templates = Jinja2Templates(directory="templates")
 # Global variables for ML models and data
 ml_models = {}
 weather_data = None
+weather_index = None
 ais_data = None
 
+WEATHER_LOOKUP_FIELDS = {
+    'wave_height_m': 1.0,
+    'wind_speed_kts': 10.0,
+    'wind_direction_deg': 180.0,
+    'temperature_c': 20.0,
+    'ocean_current_speed_kts': 1.0,
+    'ocean_current_direction_deg': 180.0,
+}
+
+def build_weather_index(df: Optional[pd.DataFrame]) -> Optional[Dict[str, np.ndarray]]:
+    """Sort weather once by time and keep NumPy arrays for O(log N) lookups"""
+    if df is None or df.empty:
+        return None
+    if 'timestamp' in df.columns:
+        time_ns = pd.to_datetime(df['timestamp'], errors='coerce').to_numpy(dtype='datetime64[ns]').astype('i8')
+    else:
+        time_ns = np.zeros(len(df), dtype='i8')
+    order = np.argsort(time_ns, kind='stable')
+
+    index = {'time_ns': time_ns[order], 'grid': None}
+    if 'latitude' in df.columns and 'longitude' in df.columns:
+        # One spatial index entry per grid cell; rows per cell stay in time order
+        positions = np.column_stack((df['latitude'].to_numpy(dtype=np.float64)[order],
+                                     df['longitude'].to_numpy(dtype=np.float64)[order]))
+        cells, cell_ids = np.unique(positions, axis=0, return_inverse=True)
+        cell_ids = cell_ids.ravel()
+        index['grid'] = SpatialIndex(cells[:, 0], cells[:, 1])
+        index['cell_rows'] = np.split(np.argsort(cell_ids, kind='stable'),
+                                      np.cumsum(np.bincount(cell_ids))[:-1])
+    for col, default in WEATHER_LOOKUP_FIELDS.items():
+        values = pd.to_numeric(df[col], errors='coerce') if col in df.columns else pd.Series(default, index=df.index)
+        index[col] = values.fillna(default).to_numpy(dtype=np.float64)[order]
+    return index
+
+def lookup_weather(index: Dict[str, np.ndarray], lat: float, lon: float, when: datetime) -> Dict[str, float]:
+    """Nearest-position, nearest-time weather record from a prebuilt index"""
+    rows = np.arange(len(index['time_ns']))
+    if index['grid'] is not None:
+        rows = index['cell_rows'][index['grid'].nearest(lat, lon)]
+
+    times = index['time_ns'][rows]
+    target = pd.Timestamp(when).value
+    pos = int(np.searchsorted(times, target))
+    if pos == len(times) or (pos > 0 and target - times[pos - 1] <= times[pos] - target):
+        pos -= 1
+    row = rows[pos]
+    return {col: float(index[col][row]) for col in WEATHER_LOOKUP_FIELDS}
+
 class ConnectionManager:
     """WebSocket connection manager for real-time updates"""
 
@@ -107,7 +157,7 @@ manager = ConnectionManager()
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application on startup"""
-    global ml_models, weather_data, ais_data
+    global ml_models, weather_data, weather_index, ais_data
 
     print("🚢 Starting Maritime Route Optimization Web App...")
 
@@ -119,6 +169,7 @@ async def startup_event():
     print("📡 Loading initial data...")
     try:
         weather_data, ais_data = load_data_from_db()
+        weather_index = build_weather_index(weather_data)
 
         # Train ML models if data is available
         if not weather_data.empty and not ais_data.empty:
@@ -167,6 +218,8 @@ async def optimize_route_endpoint(route_request: Dict[str, Any]):
 
         print(f"🧭 Optimizing route from ({start_lat}, {start_lon}) to ({end_lat}, {end_lon})")
 
+        calc = EnhancedSailingCalculator(settings)
+
         # Generate optimized route
         if ml_models and weather_data is not None:
             route = optimize_route(
@@ -176,7 +229,6 @@ async def optimize_route_endpoint(route_request: Dict[str, Any]):
             )
         else:
             # Fallback to simple route
-            calc = EnhancedSailingCalculator(settings)
             waypoints = calc.generate_waypoints(start_lat, start_lon, end_lat, end_lon, 15)
             
             # Apply land avoidance to generated waypoints in fallback scenario
@@ -184,16 +236,13 @@ async def optimize_route_endpoint(route_request: Dict[str, Any]):
             
             route = [(wp.latitude, wp.longitude) for wp in waypoints]
 
-        # Calculate route metrics
+        # Calculate route metrics (all legs in one vectorized call)
         total_distance = 0
         if len(route) > 1:
-            calc = EnhancedSailingCalculator(settings)
-            for i in range(len(route) - 1):
-                dist = calc.calculate_great_circle_distance(
-                    route[i][0], route[i][1],
-                    route[i+1][0], route[i+1][1]
-                )
-                total_distance += dist
+            coords = np.asarray(route, dtype=np.float64)
+            total_distance = float(calc.calculate_great_circle_distance_vec(
+                coords[:-1, 0], coords[:-1, 1], coords[1:, 0], coords[1:, 1]
+            ).sum())
 
         # Estimate time and fuel (simplified)
         avg_speed = 15  # knots
@@ -225,25 +274,16 @@ async def optimize_route_endpoint(route_request: Dict[str, Any]):
 async def get_current_weather(lat: float = TEST_LAT, lon: float = TEST_LON):
     """Get current weather conditions"""
     try:
-        if weather_data is not None and not weather_data.empty:
+        if weather_index is not None:
             # Find closest weather data point
-            weather_data_copy = weather_data.copy()
-            weather_data_copy['distance'] = np.sqrt(
-                (weather_data_copy.get('latitude', lat) - lat)**2 +
-                (weather_data_copy.get('longitude', lon) - lon)**2
-            )
-            closest = weather_data_copy.loc[weather_data_copy['distance'].idxmin()]
+            now = datetime.now()
+            closest = lookup_weather(weather_index, lat, lon, now)
 
             return {
                 "latitude": lat,
                 "longitude": lon,
-                "wave_height_m": float(closest.get('wave_height_m', 1.0)),
-                "wind_speed_kts": float(closest.get('wind_speed_kts', 10.0)),
-                "wind_direction_deg": float(closest.get('wind_direction_deg', 180.0)),
-                "temperature_c": float(closest.get('temperature_c', 20.0)),
-                "ocean_current_speed_kts": float(closest.get('ocean_current_speed_kts', 1.0)),
-                "ocean_current_direction_deg": float(closest.get('ocean_current_direction_deg', 180.0)),
-                "timestamp": datetime.now().isoformat()
+                **closest,
+                "timestamp": now.isoformat()
             }
 
         # Fallback: Generate sample data
@@ -267,30 +307,40 @@ async def get_nearby_vessels(lat: float = TEST_LAT, lon: float = TEST_LON, radiu
     """Get nearby vessels"""
     try:
         if ais_data is not None and not ais_data.empty:
-            # Filter vessels within radius
-            ais_copy = ais_data.copy()
-            ais_copy['distance'] = np.sqrt(
-                (ais_copy.get('latitude', lat) - lat)**2 +
-                (ais_copy.get('longitude', lon) - lon)**2
-            )
+            def column(name, default, dtype=np.float64):
+                # Whole column as one array (filled with default when the feed didn't provide it)
+                if name in ais_data.columns:
+                    return ais_data[name].to_numpy(dtype=dtype)
+                return np.full(len(ais_data), default, dtype=dtype)
 
+            # Filter vessels within radius
+            lats, lons = column('latitude', lat), column('longitude', lon)
             # Convert to nautical miles (rough approximation)
-            ais_copy['distance_nm'] = ais_copy['distance'] * 60
-
-            nearby = ais_copy[ais_copy['distance_nm'] <= radius_nm]
-
-            vessels = []
-            for _, vessel in nearby.iterrows():
-                vessels.append({
-                    "mmsi": int(vessel.get('mmsi', 0)),
-                    "name": vessel.get('name', 'Unknown'),
-                    "latitude": float(vessel.get('latitude', 0)),
-                    "longitude": float(vessel.get('longitude', 0)),
-                    "speed": float(vessel.get('speed', 0)),
-                    "course": float(vessel.get('course', 0)),
-                    "distance_nm": round(float(vessel.get('distance_nm', 0)), 1),
-                    "last_update": vessel.get('timestamp', datetime.now().isoformat())
-                })
+            distance_nm = np.sqrt((lats - lat) ** 2 + (lons - lon) ** 2) * 60
+            nearby = np.flatnonzero(distance_nm <= radius_nm)
+
+            vessels = [
+                {
+                    "mmsi": int(mmsi),
+                    "name": name,
+                    "latitude": vlat,
+                    "longitude": vlon,
+                    "speed": speed,
+                    "course": course,
+                    "distance_nm": round(dist, 1),
+                    "last_update": last_update
+                }
+                for mmsi, name, vlat, vlon, speed, course, dist, last_update in zip(
+                    column('mmsi', 0)[nearby].tolist(),
+                    column('name', 'Unknown', dtype=object)[nearby].tolist(),
+                    lats[nearby].tolist(),
+                    lons[nearby].tolist(),
+                    column('speed', 0)[nearby].tolist(),
+                    column('course', 0)[nearby].tolist(),
+                    distance_nm[nearby].tolist(),
+                    column('timestamp', datetime.now().isoformat(), dtype=object)[nearby].tolist(),
+                )
+            ]
 
             return {"vessels": vessels, "count": len(vessels)}
 
@@ -315,14 +365,14 @@ async def websocket_endpoint(websocket: WebSocket):
 @app.post("/api/data/refresh")
 async def refresh_data():
     """Refresh AIS and weather data"""
-    global weather_data, ais_data, ml_models
+    global weather_data, weather_index, ais_data, ml_models
 
     try:
         print("🔄 Refreshing data...")
 
         # Collect fresh data
         ais_collector = AISDataCollector(AISSTREAM_API_KEY, SF_BAY_BOUNDS)
-        fresh_ais = ais_collector.start_collection(duration_seconds=60)
+        fresh_ais = await ais_collector.start_collection_async(duration_seconds=60)
 
         fresh_open_meteo = fetch_open_meteo_weather(TEST_LAT, TEST_LON, hours=24)
         fresh_tomorrow = fetch_tomorrow_io_weather(TEST_LAT, TEST_LON, TOMORROW_IO_API_KEY, hours=24)
@@ -336,11 +386,12 @@ async def refresh_data():
 
         # Reload data
         weather_data, ais_data = load_data_from_db()
+        weather_index = build_weather_index(weather_data)
 
         # Retrain ML models
         if not weather_data.empty and not ais_data.empty:
             X, y = prepare_ml_data(weather_data, ais_data)
-            model, scaler = train_route_optimization_model(X, y)
+            model, scaler = train_route_optimization_model(X, y, settings.ML_MODEL_PATH)
             ml_models = {"model": model, "scaler": scaler}
 
         # Broadcast update